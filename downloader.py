@@ -41,8 +41,7 @@ class Downloader:
         self.download_dir = download_dir
         
         # Create download directory if it doesn't exist
-        if not os.path.exists(download_dir):
-            os.makedirs(download_dir)
+        os.makedirs(download_dir, exist_ok=True)
             
         # Set up yt-dlp options
         # Check for FFmpeg availability
@@ -113,13 +112,10 @@ class Downloader:
             'C:\\Program Files\\ffmpeg\\bin\\ffmpeg.exe',
         ]
         
+        # An executable file is enough, no need to start ffmpeg to prove it
         for path in possible_paths:
-            if os.path.exists(path):
-                try:
-                    subprocess.check_output([path, "-version"], stderr=subprocess.DEVNULL)
-                    return os.path.dirname(path)
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    continue
+            if os.path.isfile(path) and os.access(path, os.X_OK):
+                return os.path.dirname(path)
         
         return None
     
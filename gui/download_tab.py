@@ -3,8 +3,11 @@ Download tab for the main application window
 """
 
 import os
+import re
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
@@ -22,6 +25,54 @@ from utils.song_filter import SongFilter
 from utils.config import Config
 from process_text import clean_search_query, extract_song_info
 
+logger = logging.getLogger(__name__)
+
+# Search results matched against Spotify at the same time
+SPOTIFY_MATCH_WORKERS = 4
+
+# YouTube title decorations, compiled once and applied in order
+_YOUTUBE_TITLE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'\[.*?\]',
+        r'\(.*?\)',
+        r'official.*?video',
+        r'official.*?audio',
+        r'lyrics?',
+        r'hd',
+        r'4k',
+    )
+]
+
+# Decorations removed from titles used as song metadata
+_METADATA_TITLE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'\[.*?\]',  # Remove anything in square brackets
+        r'\(.*?\)',  # Remove anything in parentheses
+        r'【.*?】',  # Remove anything in these brackets
+        r'official.*?video',  # Remove "official video" etc
+        r'official.*?audio',  # Remove "official audio" etc
+        r'lyrics?',  # Remove "lyrics" or "lyric"
+        r'hd',  # Remove "HD"
+        r'4k',  # Remove "4K"
+    )
+]
+
+@lru_cache(maxsize=4096)
+def _parse_duration_to_seconds(duration_str: str) -> int:
+    """Parse duration string to seconds"""
+    try:
+        if ':' in duration_str:
+            parts = duration_str.split(':')
+            if len(parts) == 2:
+                minutes, seconds = parts
+                return int(minutes) * 60 + int(seconds)
+            elif len(parts) == 3:
+                hours, minutes, seconds = parts
+                return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+        return 0
+    except:
+        return 0
+
 class DownloadWorker(QThread):
     """Worker thread for downloading music"""
     
@@ -359,7 +410,6 @@ class DownloadTab(QWidget):
         self.back_button.clicked.connect(self._on_back_to_search)
         
         # Quality dropdown - responsive design with symbol and text
-        from PyQt6.QtWidgets import QComboBox
         self.quality_dropdown = QComboBox()
         self.quality_dropdown.setMinimumSize(40, 40)
         for quality in AudioQuality:
@@ -467,14 +517,6 @@ class DownloadTab(QWidget):
                 QMessageBox.warning(self, "Empty Search", "Please enter a search term.")
                 return
             
-            # Initialize search components safely
-            if not hasattr(self, 'youtube_searcher'):
-                self.youtube_searcher = YouTubeSearch()
-            if not hasattr(self, 'spotify_searcher'):
-                self.spotify_searcher = SpotifySearch()
-            if not hasattr(self, 'song_filter'):
-                self.song_filter = SongFilter()
-            
             # Start UI transition animation
             self._animate_to_results_state()
             
@@ -1075,13 +1117,16 @@ class DownloadTab(QWidget):
                 QMessageBox.information(self, "No Results", "No song results found for your search term.")
                 return
             
-            # Process results with Spotify matching
+            # Process results with Spotify matching, looking up several results at once so
+            # their Spotify round-trips overlap. Follow-up YouTube searches for duration
+            # mismatches share one YoutubeDL and still run one at a time
             self.youtube_results = []
             self.processed_results = []
             
-            for result in filtered_youtube_results:
-                spotify_track, better_youtube = self._search_spotify_for_youtube_result(result)
-                
+            with ThreadPoolExecutor(max_workers=SPOTIFY_MATCH_WORKERS) as executor:
+                matches = list(executor.map(self._search_spotify_for_youtube_result, filtered_youtube_results))
+            
+            for result, (spotify_track, better_youtube) in zip(filtered_youtube_results, matches):
                 # Use better YouTube result if found, otherwise use original
                 final_youtube_result = better_youtube if better_youtube else result
                 
@@ -1476,26 +1521,14 @@ class DownloadTab(QWidget):
             return None, None
                     
         except Exception as e:
-            print(f"Spotify search failed: {str(e)}")
+            logger.error(f"Spotify search failed: {str(e)}")
             return None, None
     
     def _simplify_youtube_title(self, title: str) -> str:
         """Remove YouTube-specific decorations from title"""
-        import re
-        
-        patterns = [
-            r'\[.*?\]',
-            r'\(.*?\)',
-            r'official.*?video',
-            r'official.*?audio',
-            r'lyrics?',
-            r'hd',
-            r'4k',
-        ]
-        
         cleaned = title
-        for pattern in patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        for pattern in _YOUTUBE_TITLE_PATTERNS:
+            cleaned = pattern.sub('', cleaned)
         
         return ' '.join(cleaned.split()).strip()
     
@@ -1553,7 +1586,7 @@ class DownloadTab(QWidget):
         """Search for a better YouTube video using artist - song format when duration mismatch > 5s"""
         try:
             search_query = f"{artist} - {song_name}"
-            print(f"Duration mismatch detected, searching YouTube for: '{search_query}'")
+            logger.info(f"Duration mismatch detected, searching YouTube for: '{search_query}'")
             
             # Use the YouTube searcher to find better match
             if hasattr(self, 'youtube') and self.youtube:
@@ -1563,41 +1596,25 @@ class DownloadTab(QWidget):
                     spotify_duration = spotify_track.get('duration_ms', 0) // 1000
                     
                     # Find the result with closest duration match
-                    best_youtube = None
-                    best_duration_diff = float('inf')
-                    
-                    for result in search_results:
-                        youtube_duration = self._parse_duration_to_seconds(result.get('duration', '0:00'))
-                        duration_diff = abs(spotify_duration - youtube_duration)
-                        
-                        if duration_diff < best_duration_diff and duration_diff <= 5:
-                            best_duration_diff = duration_diff
-                            best_youtube = result
-                    
-                    if best_youtube and best_duration_diff <= 5:
-                        print(f"Found better YouTube match with {best_duration_diff}s duration difference")
+                    candidates = [
+                        (abs(spotify_duration - _parse_duration_to_seconds(result.get('duration', '0:00'))), result)
+                        for result in search_results
+                    ]
+                    best_duration_diff, best_youtube = min(candidates, key=lambda candidate: candidate[0])
+
+                    if best_duration_diff <= 5:
+                        logger.info(f"Found better YouTube match with {best_duration_diff}s duration difference")
                         return best_youtube
             
             return None
             
         except Exception as e:
-            print(f"Error searching for better YouTube video: {e}")
+            logger.error(f"Error searching for better YouTube video: {str(e)}")
             return None
     
     def _parse_duration_to_seconds(self, duration_str: str) -> int:
         """Parse duration string to seconds"""
-        try:
-            if ':' in duration_str:
-                parts = duration_str.split(':')
-                if len(parts) == 2:
-                    minutes, seconds = parts
-                    return int(minutes) * 60 + int(seconds)
-                elif len(parts) == 3:
-                    hours, minutes, seconds = parts
-                    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
-            return 0
-        except:
-            return 0
+        return _parse_duration_to_seconds(duration_str)
     
     def _extract_youtube_metadata(self, youtube_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Extract basic metadata from YouTube video title and info"""
@@ -1636,23 +1653,10 @@ class DownloadTab(QWidget):
     
     def _clean_title_for_metadata(self, title: str) -> str:
         """Clean YouTube title for use as song title metadata"""
-        import re
-        
         # Remove common YouTube decorations
-        patterns = [
-            r'\[.*?\]',  # Remove anything in square brackets
-            r'\(.*?\)',  # Remove anything in parentheses
-            r'【.*?】',  # Remove anything in these brackets
-            r'official.*?video',  # Remove "official video" etc
-            r'official.*?audio',  # Remove "official audio" etc
-            r'lyrics?',  # Remove "lyrics" or "lyric"
-            r'hd',  # Remove "HD"
-            r'4k',  # Remove "4K"
-        ]
-        
         cleaned = title
-        for pattern in patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        for pattern in _METADATA_TITLE_PATTERNS:
+            cleaned = pattern.sub('', cleaned)
         
         # Clean up extra whitespace
         cleaned = ' '.join(cleaned.split())
@@ -1661,15 +1665,4 @@ class DownloadTab(QWidget):
     
     def _parse_duration_to_ms(self, duration_str: str) -> int:
         """Parse duration string to milliseconds"""
-        try:
-            if ':' in duration_str:
-                parts = duration_str.split(':')
-                if len(parts) == 2:
-                    minutes, seconds = parts
-                    return (int(minutes) * 60 + int(seconds)) * 1000
-                elif len(parts) == 3:
-                    hours, minutes, seconds = parts
-                    return (int(hours) * 3600 + int(minutes) * 60 + int(seconds)) * 1000
-            return 0
-        except:
-            return 0
\ No newline at end of file
+        return _parse_duration_to_seconds(duration_str) * 1000
\ No newline at end of file
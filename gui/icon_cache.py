@@ -0,0 +1,88 @@
+"""
+Icon cache
+Keeps loaded icons and scaled pixmaps around so image assets are only parsed once
+"""
+
+from typing import Dict, Tuple
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QIcon, QPixmap, QPainter, QFont
+
+class IconCache:
+    """Process-wide cache of QIcon and QPixmap objects keyed by file path"""
+
+    _icons: Dict[str, QIcon] = {}
+    _pixmaps: Dict[Tuple[str, int, int], QPixmap] = {}
+    _glyph_icons: Dict[Tuple[str, int], QIcon] = {}
+
+    @classmethod
+    def get_icon(cls, path: str) -> QIcon:
+        """
+        Get an icon for the given image file
+
+        Args:
+            path: Path to the image file
+
+        Returns:
+            The cached icon
+        """
+        icon = cls._icons.get(path)
+        if icon is None:
+            icon = QIcon(path)
+            cls._icons[path] = icon
+        return icon
+
+    @classmethod
+    def get_pixmap(cls, path: str, width: int, height: int) -> QPixmap:
+        """
+        Get a pixmap of the given image file rendered at the requested size
+
+        The pixmap is produced through the cached icon, so vector images are
+        rasterized straight at the target size instead of being loaded at full
+        resolution and scaled down afterwards.
+
+        Args:
+            path: Path to the image file
+            width: Target width in pixels
+            height: Target height in pixels
+
+        Returns:
+            The cached pixmap
+        """
+        key = (path, width, height)
+        pixmap = cls._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = cls.get_icon(path).pixmap(QSize(width, height))
+            cls._pixmaps[key] = pixmap
+        return pixmap
+
+    @classmethod
+    def get_glyph_icon(cls, glyph: str, size: int) -> QIcon:
+        """
+        Get an icon showing a text glyph such as an emoji
+
+        The glyph is drawn into a pixmap once, so buttons using it blit a
+        bitmap instead of shaping the emoji text on every repaint.
+
+        Args:
+            glyph: Text to draw, usually a single emoji
+            size: Icon width and height in pixels
+
+        Returns:
+            The cached icon
+        """
+        key = (glyph, size)
+        icon = cls._glyph_icons.get(key)
+        if icon is None:
+            pixmap = QPixmap(size, size)
+            pixmap.fill(Qt.GlobalColor.transparent)
+
+            painter = QPainter(pixmap)
+            font = QFont()
+            font.setPixelSize(size)
+            painter.setFont(font)
+            painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, glyph)
+            painter.end()
+
+            icon = QIcon(pixmap)
+            cls._glyph_icons[key] = icon
+        return icon
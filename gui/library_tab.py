@@ -18,6 +18,7 @@ from search_spotify import SpotifySearch
 from utils.config import Config
 from library.scanner import LibraryScanner
 from library.metadata import MetadataManager
+from library.track_info import TrackInfo
 
 logger = logging.getLogger(__name__)
 
@@ -113,10 +114,16 @@ class LibraryTab(QWidget):
         # Track list
         self.tracks = []
         
+        # Lazily built list of tracks with incomplete metadata
+        self._incomplete_tracks = None
+        
         # Worker threads
         self.scan_worker = None
         self.metadata_worker = None
         
+        # Kept for the lifetime of the tab so album art is shared between updates
+        self.metadata_manager = MetadataManager()
+        
         # Initialize UI
         self._init_ui()
         
@@ -229,6 +236,7 @@ class LibraryTab(QWidget):
         
         # Clear previous results
         self.tracks = []
+        self._incomplete_tracks = None
         self.library_table.setRowCount(0)
         
         # Show progress bar and status
@@ -258,7 +266,7 @@ class LibraryTab(QWidget):
         
         self.status_label.setText(f"Scanning: {os.path.basename(current_file)}")
     
-    def _scan_complete(self, tracks: List[Dict[str, Any]]):
+    def _scan_complete(self, tracks: List[TrackInfo]):
         """
         Handle scan completion
         
@@ -266,6 +274,7 @@ class LibraryTab(QWidget):
             tracks: List of track information
         """
         self.tracks = tracks
+        self._incomplete_tracks = None
         self.status_label.setText(f"Found {len(tracks)} tracks.")
         
         # Apply filters and populate the table
@@ -292,10 +301,10 @@ class LibraryTab(QWidget):
         # Populate table
         for row, track in enumerate(filtered_tracks):
             # Basic info
-            title_item = QTableWidgetItem(track.get('title', 'Unknown'))
-            artist_item = QTableWidgetItem(track.get('artist', 'Unknown'))
-            album_item = QTableWidgetItem(track.get('album', 'Unknown'))
-            year_item = QTableWidgetItem(track.get('year', ''))
+            title_item = QTableWidgetItem(track.title)
+            artist_item = QTableWidgetItem(track.artist)
+            album_item = QTableWidgetItem(track.album)
+            year_item = QTableWidgetItem(track.year)
             
             # Status
             status = "Complete" if self._is_metadata_complete(track) else "Incomplete"
@@ -320,7 +329,7 @@ class LibraryTab(QWidget):
                 update_btn.clicked.connect(lambda checked, r=row: self._update_track_metadata(r))
                 self.library_table.setCellWidget(row, 5, update_btn)
     
-    def _get_filtered_tracks(self) -> List[Dict[str, Any]]:
+    def _get_filtered_tracks(self) -> List[TrackInfo]:
         """
         Get tracks based on current filter settings
         
@@ -328,7 +337,9 @@ class LibraryTab(QWidget):
             Filtered list of tracks
         """
         if self.show_incomplete_only.isChecked():
-            return [track for track in self.tracks if not self._is_metadata_complete(track)]
+            if self._incomplete_tracks is None:
+                self._incomplete_tracks = [track for track in self.tracks if not self._is_metadata_complete(track)]
+            return self._incomplete_tracks
         else:
             return self.tracks
     
@@ -336,24 +347,22 @@ class LibraryTab(QWidget):
         """Apply current filters and update table"""
         self._populate_library_table()
     
-    def _is_metadata_complete(self, track: Dict[str, Any]) -> bool:
+    def _is_metadata_complete(self, track: TrackInfo) -> bool:
         """
         Check if track metadata is complete
         
         Args:
-            track: Track information dictionary
+            track: Track information
             
         Returns:
             True if metadata is complete, False otherwise
         """
         # Check for required fields
-        required_fields = ['title', 'artist', 'album']
-        for field in required_fields:
-            if not track.get(field):
-                return False
+        if not (track.title and track.artist and track.album):
+            return False
                 
         # Check for album art
-        if not track.get('has_cover'):
+        if not track.has_cover:
             return False
             
         return True
@@ -370,7 +379,7 @@ class LibraryTab(QWidget):
             return
             
         track = self._get_filtered_tracks()[row]
-        file_path = track.get('file_path')
+        file_path = track.file_path
         
         if not file_path or not os.path.exists(file_path):
             QMessageBox.warning(
@@ -381,8 +390,8 @@ class LibraryTab(QWidget):
             return
         
         # Build search query
-        title = track.get('title', '')
-        artist = track.get('artist', '')
+        title = track.title
+        artist = track.artist
         
         if title and artist:
             search_query = f"{artist} {title}"
@@ -465,22 +474,25 @@ class LibraryTab(QWidget):
                 self.status_label.setText("Updating metadata...")
                 
                 # Apply metadata to file
-                metadata_manager = MetadataManager()
-                success = metadata_manager.update_metadata(file_path, metadata)
+                success = self.metadata_manager.update_metadata(file_path, metadata)
                 
                 if success:
                     self.status_label.setText("Metadata updated successfully.")
                     
                     # Update track in our list
                     for track in self.tracks:
-                        if track.get('file_path') == file_path:
-                            track.update({
-                                'title': metadata.get('title', track.get('title', '')),
-                                'artist': metadata.get('artist', track.get('artist', '')),
-                                'album': metadata.get('album', track.get('album', '')),
-                                'year': metadata.get('year', track.get('year', '')),
-                                'has_cover': True  # Assuming cover art was added
-                            })
+                        if track.file_path == file_path:
+                            track.title = metadata.get('title', track.title)
+                            track.artist = metadata.get('artist', track.artist)
+                            track.album = metadata.get('album', track.album)
+                            track.year = metadata.get('year', track.year)
+                            track.has_cover = True  # Assuming cover art was added
+                            
+                            # Drop the track from the incomplete list once it is complete
+                            if (self._incomplete_tracks is not None
+                                    and self._is_metadata_complete(track)
+                                    and track in self._incomplete_tracks):
+                                self._incomplete_tracks.remove(track)
                             break
                     
                     # Update the table
@@ -5,22 +5,46 @@ Handles the main window layout with sidebar navigation
 
 import os
 import logging
+from functools import partial
 from typing import Dict, Any, List
 from PyQt6.QtWidgets import (
     QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, 
     QSplitter, QLabel, QPushButton, QFileDialog, QMessageBox,
-    QStackedWidget
+    QStackedWidget, QButtonGroup, QSizePolicy
 )
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QRunnable, QThreadPool
 from PyQt6.QtGui import QIcon, QAction, QPixmap
 
 from gui.download_tab import DownloadTab
 from gui.library_tab import LibraryTab
-from gui.style import get_stylesheet, Theme
+from gui.audio_quality_selector import AudioQualitySelector
+from gui.icon_cache import IconCache
 from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Application root and icon location, resolved once at import
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_APP_ICON_PATH = os.path.join(_ROOT, "assets", "app_icon.svg")
+_APP_ICON_EXISTS = os.path.exists(_APP_ICON_PATH)
+
+class _SaveConfigTask(QRunnable):
+    """Background task that writes the configuration to disk"""
+    
+    def __init__(self, config: Config):
+        """
+        Initialize the save task
+        
+        Args:
+            config: Configuration to save
+        """
+        super().__init__()
+        self.config = config
+    
+    def run(self):
+        """Save the configuration"""
+        self.config.save()
+
 class MainWindow(QMainWindow):
     """Main application window"""
     
@@ -41,12 +65,8 @@ class MainWindow(QMainWindow):
         self.resize(1100, 700)
         
         # Set window icon
-        icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "app_icon.svg")
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
-        
-        # Apply stylesheet
-        self.setStyleSheet(get_stylesheet(Theme.DARK))
+        if _APP_ICON_EXISTS:
+            self.setWindowIcon(IconCache.get_icon(_APP_ICON_PATH))
         
         # Initialize UI
         self._init_ui()
@@ -74,19 +94,24 @@ class MainWindow(QMainWindow):
         # Create pages
         self.download_page = DownloadTab(self.config)
         self.library_page = LibraryTab(self.config)
-        self.settings_page = self._create_settings_page()
-        self.about_page = self._create_about_page()
         
         # Add pages to stack
         self.content_stack.addWidget(self.download_page)
         self.content_stack.addWidget(self.library_page)
-        self.content_stack.addWidget(self.settings_page)
-        self.content_stack.addWidget(self.about_page)
+        
+        # Settings and About are built the first time they are shown,
+        # a placeholder holds their slot in the stack until then
+        self._page_factories = {
+            2: self._create_settings_page,
+            3: self._create_about_page,
+        }
+        for _ in self._page_factories:
+            self.content_stack.addWidget(QWidget())
         
         # Create status bar
-        status_bar = self.statusBar()
-        if status_bar:
-            status_bar.showMessage("Ready")
+        self._status_bar = self.statusBar()
+        if self._status_bar:
+            self._status_bar.showMessage("Ready")
         
         # Create menu bar
         self._create_menu_bar()
@@ -100,6 +125,7 @@ class MainWindow(QMainWindow):
         """
         sidebar = QWidget()
         sidebar.setObjectName("sidebar")
+        sidebar.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         
         layout = QVBoxLayout(sidebar)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -113,10 +139,8 @@ class MainWindow(QMainWindow):
         # App icon
         icon_label = QLabel()
         icon_label.setFixedSize(24, 24)
-        icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "app_icon.svg")
-        if os.path.exists(icon_path):
-            icon_pixmap = QPixmap(icon_path)
-            icon_label.setPixmap(icon_pixmap.scaled(24, 24, Qt.AspectRatioMode.KeepAspectRatio))
+        if _APP_ICON_EXISTS:
+            icon_label.setPixmap(IconCache.get_pixmap(_APP_ICON_PATH, 24, 24))
         title_layout.addWidget(icon_label)
         
         # App title
@@ -128,8 +152,10 @@ class MainWindow(QMainWindow):
         layout.addWidget(title_container)
         layout.addSpacing(10)
         
-        # Navigation buttons
+        # Navigation buttons, grouped so one slot receives the clicked page index
         self.nav_buttons = []
+        self._nav_group = QButtonGroup(self)
+        self._nav_group.setExclusive(True)
         
         # Download button
         download_btn = self._create_sidebar_button("Download", "📥", 0)
@@ -151,6 +177,8 @@ class MainWindow(QMainWindow):
         layout.addWidget(about_btn)
         self.nav_buttons.append(about_btn)
         
+        self._nav_group.idClicked.connect(self._on_sidebar_button_clicked)
+        
         # Set the first button as active
         self._set_active_button(0)
         
@@ -171,13 +199,15 @@ class MainWindow(QMainWindow):
         Returns:
             The created button
         """
-        button = QPushButton(f"{icon_text}  {text}")
+        button = QPushButton(text)
         button.setObjectName("sidebar_button")
+        button.setIcon(IconCache.get_glyph_icon(icon_text, 18))
+        button.setIconSize(QSize(18, 18))
         button.setCheckable(True)
         button.setFixedHeight(45)
         
-        # Connect click event
-        button.clicked.connect(lambda: self._on_sidebar_button_clicked(page_index))
+        # Register with the navigation group under its page index
+        self._nav_group.addButton(button, page_index)
         
         return button
     
@@ -188,9 +218,27 @@ class MainWindow(QMainWindow):
         Args:
             index: Index of the page to show
         """
+        self._ensure_page_built(index)
         self.content_stack.setCurrentIndex(index)
         self._set_active_button(index)
     
+    def _ensure_page_built(self, index: int):
+        """
+        Replace a placeholder page with the real page on first visit
+        
+        Args:
+            index: Index of the page in the content stack
+        """
+        factory = self._page_factories.pop(index, None)
+        if factory is None:
+            return
+        
+        placeholder = self.content_stack.widget(index)
+        page = factory()
+        self.content_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.content_stack.insertWidget(index, page)
+    
     def _set_active_button(self, active_index: int):
         """
         Set the active sidebar button
@@ -198,8 +246,10 @@ class MainWindow(QMainWindow):
         Args:
             active_index: Index of the button to set as active
         """
-        for i, button in enumerate(self.nav_buttons):
-            button.setChecked(i == active_index)
+        # The group is exclusive, so checking one button unchecks the rest
+        button = self._nav_group.button(active_index)
+        if button:
+            button.setChecked(True)
     
     def _create_settings_page(self) -> QWidget:
         """
@@ -246,14 +296,14 @@ class MainWindow(QMainWindow):
         quality_title.setObjectName("settings_label")
         settings_layout.addWidget(quality_title)
         
-        from PyQt6.QtWidgets import QComboBox
-        quality_selector = QComboBox()
-        quality_selector.addItems(["Best (320k)", "High (256k)", "Medium (192k)", "Low (128k)"])
-        quality_selector.setCurrentText(self.config.default_audio_quality)
+        quality_selector = AudioQualitySelector()
+        quality_selector.set_quality(self.config.default_audio_quality)
         settings_layout.addWidget(quality_selector)
         
-        settings_layout.addStretch()
+        # Keep the container at its content height, pinned to the top
+        settings_container.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Maximum)
         layout.addWidget(settings_container)
+        layout.setAlignment(settings_container, Qt.AlignmentFlag.AlignTop)
         
         return page
     
@@ -309,8 +359,10 @@ class MainWindow(QMainWindow):
         libraries_text.setObjectName("about_text")
         about_layout.addWidget(libraries_text)
         
-        about_layout.addStretch()
+        # Keep the container at its content height, pinned to the top
+        about_container.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Maximum)
         layout.addWidget(about_container)
+        layout.setAlignment(about_container, Qt.AlignmentFlag.AlignTop)
         
         return page
     
@@ -330,7 +382,7 @@ class MainWindow(QMainWindow):
         
         # Scan library action
         scan_library_action = QAction("Scan Music Library", self)
-        scan_library_action.triggered.connect(lambda: self.library_page.scan_library())
+        scan_library_action.triggered.connect(self.library_page.scan_library)
         file_menu.addAction(scan_library_action)
         
         file_menu.addSeparator()
@@ -345,7 +397,7 @@ class MainWindow(QMainWindow):
         
         # About action
         about_action = QAction("About", self)
-        about_action.triggered.connect(lambda: self._on_sidebar_button_clicked(3))
+        about_action.triggered.connect(partial(self._on_sidebar_button_clicked, 3))
         help_menu.addAction(about_action)
     
     def _set_download_location(self):
@@ -359,14 +411,16 @@ class MainWindow(QMainWindow):
         
         if new_dir:
             self.config.download_location = new_dir
-            self.config.save()
+            QThreadPool.globalInstance().start(_SaveConfigTask(self.config))
             
             # Update download tab with new location
             self.download_page.update_download_location(new_dir)
-            self.statusBar().showMessage(f"Download location set to: {new_dir}")
+            if self._status_bar:
+                self._status_bar.showMessage(f"Download location set to: {new_dir}")
     
     def closeEvent(self, event):
         """Handle window close event to save configuration"""
-        # Save any pending configuration changes
+        # Let any background save finish, then save pending changes
+        QThreadPool.globalInstance().waitForDone(2000)
         self.config.save()
         event.accept()
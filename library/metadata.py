@@ -4,24 +4,58 @@ Handles updating metadata for music files
 """
 
 import os
+import shutil
+import hashlib
 import logging
-from typing import Dict, Any, Optional
-import requests
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, BinaryIO, Tuple
 from io import BytesIO
 import mutagen
 from mutagen.id3 import ID3, TIT2, TPE1, TALB, TDRC, APIC
 from mutagen.mp3 import MP3
 from mutagen.flac import FLAC, Picture
 from mutagen.mp4 import MP4, MP4Cover
+from utils.helpers import create_http_session
 
 logger = logging.getLogger(__name__)
 
+# Downloaded album art is kept on disk so tracks sharing a cover URL fetch it once
+ART_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "music_downloader", "artcache")
+ART_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# File extension of cached album art by image type
+ART_CACHE_EXTENSIONS = {'image/jpeg': '.jpg', 'image/png': '.png'}
+
+# Covers kept in memory per manager; a batch update rarely spans more albums than this
+ART_MEMO_SIZE = 16
+
+def _image_mime_type(data: bytes) -> str:
+    """
+    Get the MIME type of album art from its first bytes
+    
+    Args:
+        data: Image data, or at least its first bytes
+        
+    Returns:
+        'image/png' for PNG images, otherwise 'image/jpeg'
+    """
+    return 'image/png' if data.startswith(b'\x89PNG') else 'image/jpeg'
+
 class MetadataManager:
     """Class to handle music metadata updates"""
     
+    # Shared across instances so connections to the image host are kept alive
+    _session = create_http_session()
+    
     def __init__(self):
         """Initialize the metadata manager"""
-        pass
+        # Album art and its MIME type by SHA-1 of the image, so tracks sharing a cover share one copy.
+        # Least recently used first; older covers are reloaded from the disk cache when needed again
+        self._art_by_sha: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        
+        # Cover objects built from that art, keyed on (image SHA-1, tag format)
+        self._art_objects: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
     
     def update_metadata(self, file_path: str, metadata: Dict[str, Any]) -> bool:
         """
@@ -71,35 +105,29 @@ class MetadataManager:
             if audio.tags is None:
                 audio.add_tags()
             
-            # Apply the metadata
-            if 'title' in metadata:
-                audio.tags.add(TIT2(encoding=3, text=metadata['title']))
-            
-            if 'artist' in metadata:
-                audio.tags.add(TPE1(encoding=3, text=metadata['artist']))
-                
-            if 'album' in metadata:
-                audio.tags.add(TALB(encoding=3, text=metadata['album']))
-                
-            if 'year' in metadata:
-                audio.tags.add(TDRC(encoding=3, text=metadata['year']))
+            # Apply the metadata, only touching frames whose value differs
+            changed = False
+            for key, frame_id, frame_class in (('title', 'TIT2', TIT2), ('artist', 'TPE1', TPE1),
+                                               ('album', 'TALB', TALB), ('year', 'TDRC', TDRC)):
+                if key in metadata:
+                    if frame_id in audio.tags and str(audio.tags[frame_id]) == str(metadata[key]):
+                        continue
+                    audio.tags.add(frame_class(encoding=3, text=metadata[key]))
+                    changed = True
                 
             # Add album art if available
             if 'album_art_url' in metadata and metadata['album_art_url']:
-                album_art_data = self._download_album_art(metadata['album_art_url'])
-                if album_art_data:
-                    audio.tags.add(
-                        APIC(
-                            encoding=3,
-                            mime='image/jpeg',
-                            type=3,  # Cover (front)
-                            desc='Cover',
-                            data=album_art_data
-                        )
-                    )
+                album_art = self._get_album_art(metadata['album_art_url'])
+                if album_art and not any(frame.data == album_art[1] for frame in audio.tags.getall('APIC')):
+                    audio.tags.add(self._get_art_object(album_art, 'mp3'))
+                    changed = True
             
-            # Save the changes
-            audio.save()
+            # Nothing to write, so skip rewriting the file
+            if not changed:
+                return True
+            
+            # Save the changes, reserving padding so later edits fit in place
+            audio.save(padding=lambda info: max(info.padding, 2048))
             return True
             
         except Exception as e:
@@ -121,37 +149,29 @@ class MetadataManager:
             # Load the audio file
             audio = FLAC(file_path)
             
-            # Apply the metadata
-            if 'title' in metadata:
-                audio['title'] = metadata['title']
-            
-            if 'artist' in metadata:
-                audio['artist'] = metadata['artist']
-                
-            if 'album' in metadata:
-                audio['album'] = metadata['album']
-                
-            if 'year' in metadata:
-                audio['date'] = metadata['year']
+            # Apply the metadata, only touching tags whose value differs
+            changed = False
+            for key, tag in (('title', 'title'), ('artist', 'artist'),
+                             ('album', 'album'), ('year', 'date')):
+                if key in metadata and audio.get(tag) != [metadata[key]]:
+                    audio[tag] = metadata[key]
+                    changed = True
             
             # Add album art if available
             if 'album_art_url' in metadata and metadata['album_art_url']:
-                album_art_data = self._download_album_art(metadata['album_art_url'])
-                if album_art_data:
-                    # Remove existing pictures
+                album_art = self._get_album_art(metadata['album_art_url'])
+                if album_art and not any(pic.data == album_art[1] for pic in audio.pictures):
+                    # Replace existing pictures
                     audio.clear_pictures()
-                    
-                    # Add new picture
-                    picture = Picture()
-                    picture.type = 3  # Cover (front)
-                    picture.mime = 'image/jpeg'
-                    picture.desc = 'Cover'
-                    picture.data = album_art_data
-                    
-                    audio.add_picture(picture)
+                    audio.add_picture(self._get_art_object(album_art, 'flac'))
+                    changed = True
             
-            # Save the changes
-            audio.save()
+            # Nothing to write, so skip rewriting the file
+            if not changed:
+                return True
+            
+            # Save the changes, reserving padding so later edits fit in place
+            audio.save(padding=lambda info: max(info.padding, 4096))
             return True
             
         except Exception as e:
@@ -173,24 +193,24 @@ class MetadataManager:
             # Load the audio file
             audio = MP4(file_path)
             
-            # Apply the metadata
-            if 'title' in metadata:
-                audio['\xa9nam'] = [metadata['title']]
-            
-            if 'artist' in metadata:
-                audio['\xa9ART'] = [metadata['artist']]
-                
-            if 'album' in metadata:
-                audio['\xa9alb'] = [metadata['album']]
-                
-            if 'year' in metadata:
-                audio['\xa9day'] = [metadata['year']]
+            # Apply the metadata, only touching atoms whose value differs
+            changed = False
+            for key, atom in (('title', '\xa9nam'), ('artist', '\xa9ART'),
+                              ('album', '\xa9alb'), ('year', '\xa9day')):
+                if key in metadata and audio.get(atom) != [metadata[key]]:
+                    audio[atom] = [metadata[key]]
+                    changed = True
             
             # Add album art if available
             if 'album_art_url' in metadata and metadata['album_art_url']:
-                album_art_data = self._download_album_art(metadata['album_art_url'])
-                if album_art_data:
-                    audio['covr'] = [MP4Cover(album_art_data, imageformat=MP4Cover.FORMAT_JPEG)]
+                album_art = self._get_album_art(metadata['album_art_url'])
+                if album_art and not any(bytes(cover) == album_art[1] for cover in audio.get('covr', [])):
+                    audio['covr'] = [self._get_art_object(album_art, 'm4a')]
+                    changed = True
+            
+            # Nothing to write, so skip rewriting the file
+            if not changed:
+                return True
             
             # Save the changes
             audio.save()
@@ -200,6 +220,73 @@ class MetadataManager:
             logger.error(f"Failed to update M4A metadata: {str(e)}")
             return False
     
+    def _get_album_art(self, url: str) -> Optional[Tuple[str, bytes, str]]:
+        """
+        Get album art, sharing one copy between downloads with identical content
+        
+        Args:
+            url: URL of the album art
+            
+        Returns:
+            Tuple of (SHA-1 of the image, binary data, MIME type) or None if failed
+        """
+        data = self._download_album_art(url)
+        if not data:
+            return None
+        
+        sha = hashlib.sha1(data).hexdigest()
+        art = self._art_by_sha.get(sha)
+        if art is None:
+            mime = _image_mime_type(data)
+            art = self._art_by_sha[sha] = (data, mime)
+            if len(self._art_by_sha) > ART_MEMO_SIZE:
+                self._art_by_sha.popitem(last=False)
+        else:
+            self._art_by_sha.move_to_end(sha)
+        
+        data, mime = art
+        return sha, data, mime
+    
+    def _get_art_object(self, album_art: Tuple[str, bytes, str], file_format: str) -> Any:
+        """
+        Get the cover object to embed for a file format, building it once per image
+        
+        Args:
+            album_art: Tuple of (SHA-1 of the image, binary data, MIME type)
+            file_format: One of 'mp3', 'flac' or 'm4a'
+            
+        Returns:
+            APIC frame, FLAC Picture or MP4Cover
+        """
+        sha, data, mime = album_art
+        art_object = self._art_objects.get((sha, file_format))
+        if art_object is not None:
+            self._art_objects.move_to_end((sha, file_format))
+            return art_object
+        
+        if file_format == 'mp3':
+            art_object = APIC(
+                encoding=3,
+                mime=mime,
+                type=3,  # Cover (front)
+                desc='Cover',
+                data=data
+            )
+        elif file_format == 'flac':
+            art_object = Picture()
+            art_object.type = 3  # Cover (front)
+            art_object.mime = mime
+            art_object.desc = 'Cover'
+            art_object.data = data
+        else:
+            image_format = MP4Cover.FORMAT_PNG if mime == 'image/png' else MP4Cover.FORMAT_JPEG
+            art_object = MP4Cover(data, imageformat=image_format)
+        
+        self._art_objects[(sha, file_format)] = art_object
+        if len(self._art_objects) > ART_MEMO_SIZE:
+            self._art_objects.popitem(last=False)
+        return art_object
+    
     def _download_album_art(self, url: str) -> Optional[bytes]:
         """
         Download album art from URL
@@ -210,15 +297,90 @@ class MetadataManager:
         Returns:
             Binary data of the album art or None if failed
         """
+        cache_stem = os.path.join(ART_CACHE_DIR, hashlib.sha1(url.encode()).hexdigest())
+        
+        # Serve from the disk cache when this URL was downloaded before
+        for extension in ART_CACHE_EXTENSIONS.values():
+            cache_path = cache_stem + extension
+            try:
+                with open(cache_path, 'rb') as f:
+                    data = f.read()
+                os.utime(cache_path)  # Mark as recently used for eviction
+                return data
+            except OSError:
+                continue
+        
         try:
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                return response.content
-            else:
-                logger.error(f"Failed to download album art: {response.status_code}")
-                return None
+            with self._session.get(url, stream=True, timeout=10) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to download album art: {response.status_code}")
+                    return None
+                
+                # Stream straight into the cache file instead of buffering the whole response
+                response.raw.decode_content = True
+                data = self._store_album_art(cache_stem, response.raw)
+                if data is None:
+                    # Cache directory is not writable, keep the image in memory only
+                    return response.content
+                return data
                 
         except Exception as e:
             logger.error(f"Error downloading album art: {str(e)}")
             return None
+    
+    def _store_album_art(self, cache_stem: str, stream: BinaryIO) -> Optional[bytes]:
+        """
+        Stream album art into the disk cache
+        
+        Args:
+            cache_stem: Path of the cache file without its extension, which is
+                        picked from the type of the downloaded image
+            stream: File-like object with the image data
+            
+        Returns:
+            Binary data of the stored album art or None if the cache is not writable
+        """
+        # Write to a temporary file first so readers never see a partial image
+        tmp_path = f"{cache_stem}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(ART_CACHE_DIR, exist_ok=True)
+            tmp_file = open(tmp_path, 'wb')
+        except OSError as e:
+            logger.error(f"Error caching album art: {str(e)}")
+            return None
+        
+        try:
+            with tmp_file:
+                shutil.copyfileobj(stream, tmp_file)
+            with open(tmp_path, 'rb') as f:
+                data = f.read()
+            
+            # Name the cached file after the image type it actually holds
+            os.replace(tmp_path, cache_stem + ART_CACHE_EXTENSIONS[_image_mime_type(data)])
+        except Exception:
+            # Do not leave a partial download behind
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        try:
+            self._prune_album_art_cache()
+        except OSError as e:
+            logger.error(f"Error pruning album art cache: {str(e)}")
+        return data
+    
+    def _prune_album_art_cache(self):
+        """Remove the least recently used album art once the cache exceeds its size limit"""
+        with os.scandir(ART_CACHE_DIR) as entries:
+            files = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                     for entry in entries if entry.is_file()]
+        
+        total = sum(size for _, size, _ in files)
+        if total <= ART_CACHE_MAX_BYTES:
+            return
+        
+        for _, size, path in sorted(files):
+            os.remove(path)
+            total -= size
+            if total <= ART_CACHE_MAX_BYTES:
+                break
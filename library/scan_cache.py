@@ -0,0 +1,128 @@
+"""
+Library scan cache module
+Stores parsed track information in SQLite so unchanged files are not re-read on rescans
+"""
+
+import os
+import sqlite3
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from library.track_info import TrackInfo
+
+logger = logging.getLogger(__name__)
+
+# Bump when the tracks table or the fingerprint format changes; older caches are dropped and rebuilt
+SCHEMA_VERSION = 2
+
+class ScanCache:
+    """SQLite cache of track information keyed on (path, mtime, size)"""
+    
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (and create if needed) the scan cache database
+        
+        Args:
+            db_path: Optional path to the database file
+        """
+        # Default cache path in user's home directory, next to the config file
+        if db_path is None:
+            home_dir = os.path.expanduser("~")
+            self.db_path = os.path.join(home_dir, ".music_downloader_scan_cache.db")
+        else:
+            self.db_path = db_path
+        
+        self.conn = sqlite3.connect(self.db_path)
+        
+        # WAL with relaxed syncing keeps bulk writes from being bound by fsync
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS tracks")
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tracks ("
+            "path TEXT PRIMARY KEY, mtime REAL, size INTEGER, "
+            "title TEXT, artist TEXT, album TEXT, year TEXT, has_cover INTEGER, "
+            "fingerprint BLOB)"
+        )
+        self.conn.commit()
+    
+    def load(self) -> Dict[str, Tuple[float, int, TrackInfo]]:
+        """
+        Read every cached track in a single query
+        
+        Returns:
+            Dictionary mapping file path to (mtime, size, track info)
+        """
+        cached = {}
+        rows = self.conn.execute(
+            "SELECT path, mtime, size, title, artist, album, year, has_cover, fingerprint FROM tracks"
+        )
+        for path, mtime, size, title, artist, album, year, has_cover, fingerprint in rows:
+            cached[path] = (mtime, size, TrackInfo(
+                file_path=path,
+                filename=os.path.basename(path),
+                size=size,
+                title=title,
+                artist=artist,
+                album=album,
+                year=year,
+                has_cover=bool(has_cover),
+                fingerprint=fingerprint.hex() if fingerprint else ''
+            ))
+        return cached
+    
+    def store(self, entries: List[Tuple[float, TrackInfo]]):
+        """
+        Insert or update cached tracks in one transaction
+        
+        Args:
+            entries: List of (mtime, track info) tuples
+        """
+        if not entries:
+            return
+        
+        rows = [
+            (track.file_path, mtime, track.size, track.title, track.artist,
+             track.album, track.year, int(track.has_cover),
+             bytes.fromhex(track.fingerprint) if track.fingerprint else None)
+            for mtime, track in entries
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tracks "
+                "(path, mtime, size, title, artist, album, year, has_cover, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+    
+    def remove(self, paths: Iterable[str]):
+        """
+        Remove cached tracks in one transaction
+        
+        Args:
+            paths: File paths to remove
+        """
+        rows = [(path,) for path in paths]
+        if not rows:
+            return
+        
+        with self.conn:
+            self.conn.executemany("DELETE FROM tracks WHERE path = ?", rows)
+    
+    def invalidate(self, path: str):
+        """
+        Drop a single file from the cache so it is re-read on the next scan
+        
+        Args:
+            path: File path to invalidate
+        """
+        self.remove([path])
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
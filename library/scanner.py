@@ -4,26 +4,66 @@ Handles scanning the music library directory and retrieving track information
 """
 
 import os
+import hashlib
+import sqlite3
 import logging
-from typing import List, Dict, Any, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Callable, Tuple, Optional, Iterator, BinaryIO
 import mutagen
 from mutagen.id3 import ID3, TIT2, TPE1, TALB, TDRC, APIC
 from mutagen.mp3 import MP3
 from mutagen.flac import FLAC
 from mutagen.mp4 import MP4
+from library.scan_cache import ScanCache
+from library.track_info import TrackInfo
 
 logger = logging.getLogger(__name__)
 
+# Bytes hashed from the start and from the end of each file for its fingerprint
+FINGERPRINT_CHUNK_SIZE = 64 * 1024
+
+# Number of changed tracks written to the scan cache per transaction
+SCAN_CACHE_BATCH_SIZE = 1000
+
+# Environment variable that overrides the number of scan worker threads
+SCAN_WORKERS_ENV = "MUSIC_SCAN_WORKERS"
+
+def _default_scan_workers() -> int:
+    """
+    Get the number of worker threads used to read tags
+    
+    Returns:
+        Worker count from MUSIC_SCAN_WORKERS, or CPU count + 1
+    """
+    try:
+        workers = int(os.environ.get(SCAN_WORKERS_ENV, 0))
+    except ValueError:
+        workers = 0
+    return workers if workers > 0 else (os.cpu_count() or 1) + 1
+
 class LibraryScanner:
     """Class to handle music library scanning"""
     
-    def __init__(self):
-        """Initialize the library scanner"""
-        # Supported file extensions
-        self.supported_extensions = ('.mp3', '.flac', '.m4a', '.ogg', '.wav')
+    def __init__(self, max_workers: Optional[int] = None, cache_path: Optional[str] = None):
+        """
+        Initialize the library scanner
+        
+        Args:
+            max_workers: Number of threads used to read tags (defaults to
+                         MUSIC_SCAN_WORKERS or CPU count + 1)
+            cache_path: Optional path to the scan cache database
+        """
+        # Supported file extensions (without the dot, for set lookups)
+        self.supported_extensions = frozenset(('mp3', 'flac', 'm4a', 'ogg', 'wav'))
+        
+        # Tag reading is I/O bound, so files are read on a thread pool
+        self.max_workers = max_workers or _default_scan_workers()
+        
+        # Unchanged files are served from the scan cache instead of being re-read
+        self.cache_path = cache_path
     
     def scan_directory(self, directory: str, 
-                       progress_callback: Callable[[int, int, str], None] = None) -> List[Dict[str, Any]]:
+                       progress_callback: Callable[[int, int, str], None] = None) -> List[TrackInfo]:
         """
         Scan a directory for music files
         
@@ -33,32 +73,76 @@ class LibraryScanner:
                               Function(current_count, total_count, current_file)
                               
         Returns:
-            List of dictionaries with track information
+            List of track information
         """
         tracks = []
+        cache = None
         
         try:
             # Find all music files recursively
-            all_files = []
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    if file.lower().endswith(self.supported_extensions):
-                        all_files.append(os.path.join(root, file))
+            all_files = list(self._iter_music_files(directory))
             
             # Sort files by name for consistent ordering
-            all_files.sort()
+            all_files.sort(key=lambda item: item[0])
             
-            # Scan each file
-            for i, file_path in enumerate(all_files):
-                if progress_callback:
-                    progress_callback(i, len(all_files), file_path)
-                
+            # Load every cached track in one query
+            cached = {}
+            try:
+                cache = ScanCache(self.cache_path)
+                cached = cache.load()
+            except sqlite3.Error as e:
+                logger.error(f"Error opening scan cache: {str(e)}")
+                cache = None
+            
+            # Only files whose mtime or size changed are read again
+            stats = {}
+            hits = {}
+            for file_path, entry in all_files:
                 try:
-                    track_info = self._extract_track_info(file_path)
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                stats[file_path] = stat.st_mtime
+                cached_entry = cached.get(file_path)
+                if cached_entry and cached_entry[0] == stat.st_mtime and cached_entry[1] == stat.st_size:
+                    hits[file_path] = cached_entry[2]
+            
+            # Scan changed files on the thread pool, collecting results in file order
+            updates = []
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    item[0]: executor.submit(self._scan_file, item)
+                    for item in all_files if item[0] not in hits
+                }
+                for i, (file_path, _) in enumerate(all_files):
+                    if progress_callback:
+                        progress_callback(i, len(all_files), file_path)
+                    
+                    track_info = hits.get(file_path)
+                    if track_info is None:
+                        track_info = futures[file_path].result()
+                        if track_info and file_path in stats:
+                            updates.append((stats[file_path], track_info))
+                            
+                            # Persist in batches so an interrupted scan keeps its progress
+                            if cache and len(updates) >= SCAN_CACHE_BATCH_SIZE:
+                                self._store_in_cache(cache, updates)
+                                updates = []
+                    
                     if track_info:
                         tracks.append(track_info)
-                except Exception as e:
-                    logger.error(f"Error scanning file {file_path}: {str(e)}")
+            
+            # Write remaining entries and drop files that disappeared from this directory
+            if cache:
+                self._store_in_cache(cache, updates)
+                try:
+                    prefix = os.path.join(directory, '')
+                    cache.remove(
+                        path for path in cached
+                        if path.startswith(prefix) and path not in stats
+                    )
+                except sqlite3.Error as e:
+                    logger.error(f"Error updating scan cache: {str(e)}")
             
             if progress_callback:
                 progress_callback(len(all_files), len(all_files), "Complete")
@@ -68,165 +152,252 @@ class LibraryScanner:
         except Exception as e:
             logger.error(f"Error scanning directory {directory}: {str(e)}")
             return tracks
+        finally:
+            if cache:
+                cache.close()
+    
+    def _store_in_cache(self, cache: ScanCache, updates: List[Tuple[float, TrackInfo]]):
+        """
+        Write scanned tracks to the scan cache in one transaction
+        
+        Args:
+            cache: Open scan cache
+            updates: List of (mtime, track info) tuples
+        """
+        try:
+            cache.store(updates)
+        except sqlite3.Error as e:
+            logger.error(f"Error updating scan cache: {str(e)}")
+    
+    def _iter_music_files(self, directory: str) -> Iterator[Tuple[str, os.DirEntry]]:
+        """
+        Recursively find supported music files
+        
+        Uses os.scandir so the stat result of each entry is cached from the
+        directory read and does not need a second syscall later.
+        
+        Args:
+            directory: Directory to walk
+            
+        Yields:
+            Tuples of (file path, directory entry)
+        """
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from self._iter_music_files(entry.path)
+                        continue
+                    
+                    # A name without a dot has no extension, even if it reads "mp3"
+                    _, dot, ext = entry.name.rpartition('.')
+                    if dot and ext.lower() in self.supported_extensions:
+                        yield entry.path, entry
+        except OSError as e:
+            logger.error(f"Error reading directory {directory}: {str(e)}")
     
-    def _extract_track_info(self, file_path: str) -> Dict[str, Any]:
+    def _scan_file(self, item: Tuple[str, os.DirEntry]) -> Optional[TrackInfo]:
+        """
+        Extract track information, logging instead of raising on failure
+        
+        Args:
+            item: Tuple of (file path, directory entry)
+            
+        Returns:
+            Track information or None if the file failed
+        """
+        file_path, entry = item
+        try:
+            return self._extract_track_info(file_path, entry)
+        except Exception as e:
+            logger.error(f"Error scanning file {file_path}: {str(e)}")
+            return None
+    
+    def _extract_track_info(self, file_path: str, entry: Optional[os.DirEntry] = None) -> TrackInfo:
         """
         Extract track information from a music file
         
         Args:
             file_path: Path to the music file
+            entry: Optional directory entry for the file, whose cached stat
+                   result is used for the file size
             
         Returns:
-            Dictionary with track information
+            Track information
         """
+        size = entry.stat().st_size if entry is not None else os.path.getsize(file_path)
+        
+        # Split the name once; the stem doubles as the fallback title
+        filename = entry.name if entry is not None else os.path.basename(file_path)
+        stem, file_ext = os.path.splitext(filename)
+        file_ext = file_ext.lower()
+        
         try:
             # Initialize basic track info
-            track_info = {
-                'file_path': file_path,
-                'filename': os.path.basename(file_path),
-                'size': os.path.getsize(file_path),
-                'title': '',
-                'artist': '',
-                'album': '',
-                'year': '',
-                'has_cover': False
-            }
-            
-            # Use mutagen to extract metadata based on file type
-            file_ext = os.path.splitext(file_path)[1].lower()
-            
-            if file_ext == '.mp3':
-                self._extract_mp3_info(file_path, track_info)
-            elif file_ext == '.flac':
-                self._extract_flac_info(file_path, track_info)
-            elif file_ext == '.m4a':
-                self._extract_m4a_info(file_path, track_info)
-            else:
-                # For other formats, just use basic mutagen
-                audio = mutagen.File(file_path)
-                if audio:
-                    if 'title' in audio:
-                        track_info['title'] = str(audio['title'][0])
-                    if 'artist' in audio:
-                        track_info['artist'] = str(audio['artist'][0])
-                    if 'album' in audio:
-                        track_info['album'] = str(audio['album'][0])
+            track_info = TrackInfo(
+                file_path=file_path,
+                filename=filename,
+                size=size
+            )
+            
+            # The same handle is used for the fingerprint and for mutagen
+            with open(file_path, 'rb') as f:
+                track_info.fingerprint = self._fingerprint(f, size)
+                f.seek(0)
+                
+                # Use mutagen to extract metadata based on file type
+                if file_ext == '.mp3':
+                    self._extract_mp3_info(file_path, track_info, f)
+                elif file_ext == '.flac':
+                    self._extract_flac_info(file_path, track_info, f)
+                elif file_ext == '.m4a':
+                    self._extract_m4a_info(file_path, track_info, f)
+                else:
+                    # For other formats, just use basic mutagen
+                    audio = mutagen.File(f)
+                    if audio:
+                        if 'title' in audio:
+                            track_info.title = str(audio['title'][0])
+                        if 'artist' in audio:
+                            track_info.artist = str(audio['artist'][0])
+                        if 'album' in audio:
+                            track_info.album = str(audio['album'][0])
             
             # Use filename as fallback title if missing
-            if not track_info['title']:
-                track_info['title'] = os.path.splitext(track_info['filename'])[0]
+            if not track_info.title:
+                track_info.title = stem
             
             return track_info
             
         except Exception as e:
             logger.error(f"Error extracting track info from {file_path}: {str(e)}")
-            return {
-                'file_path': file_path,
-                'filename': os.path.basename(file_path),
-                'size': os.path.getsize(file_path),
-                'title': os.path.splitext(os.path.basename(file_path))[0],
-                'artist': '',
-                'album': '',
-                'year': '',
-                'has_cover': False
-            }
+            return TrackInfo(
+                file_path=file_path,
+                filename=filename,
+                size=size,
+                title=stem
+            )
+    
+    def _fingerprint(self, f: BinaryIO, size: int) -> str:
+        """
+        Hash the start and end of a file to identify duplicates without reading it all
+        
+        Args:
+            f: File opened in binary mode, positioned at the start
+            size: File size in bytes
+            
+        Returns:
+            Hex digest of the file's size and its first and last 64 KiB
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        # Files sharing their first and last chunks but not their length must differ
+        digest.update(size.to_bytes(8, 'little'))
+        digest.update(f.read(FINGERPRINT_CHUNK_SIZE))
+        if size > FINGERPRINT_CHUNK_SIZE:
+            # Never hash the same bytes twice for files shorter than two chunks
+            f.seek(max(size - FINGERPRINT_CHUNK_SIZE, FINGERPRINT_CHUNK_SIZE))
+            digest.update(f.read())
+        return digest.hexdigest()
     
-    def _extract_mp3_info(self, file_path: str, track_info: Dict[str, Any]):
+    def _extract_mp3_info(self, file_path: str, track_info: TrackInfo, f: BinaryIO):
         """
         Extract metadata from MP3 file
         
         Args:
             file_path: Path to MP3 file
-            track_info: Track info dictionary to update
+            track_info: Track info to update
+            f: Open handle of the file
         """
         try:
-            audio = MP3(file_path, ID3=ID3)
+            audio = MP3(f, ID3=ID3)
             
             if audio.tags:
                 # Title
                 if 'TIT2' in audio.tags:
-                    track_info['title'] = str(audio.tags['TIT2'])
+                    track_info.title = str(audio.tags['TIT2'])
                 
                 # Artist
                 if 'TPE1' in audio.tags:
-                    track_info['artist'] = str(audio.tags['TPE1'])
+                    track_info.artist = str(audio.tags['TPE1'])
                 
                 # Album
                 if 'TALB' in audio.tags:
-                    track_info['album'] = str(audio.tags['TALB'])
+                    track_info.album = str(audio.tags['TALB'])
                 
                 # Year
                 if 'TDRC' in audio.tags:
-                    track_info['year'] = str(audio.tags['TDRC'])
+                    track_info.year = str(audio.tags['TDRC'])
                 
                 # Check for cover art
                 if 'APIC:' in audio.tags or 'APIC:Cover' in audio.tags:
-                    track_info['has_cover'] = True
+                    track_info.has_cover = True
         except Exception as e:
             logger.error(f"Error reading MP3 metadata from {file_path}: {str(e)}")
     
-    def _extract_flac_info(self, file_path: str, track_info: Dict[str, Any]):
+    def _extract_flac_info(self, file_path: str, track_info: TrackInfo, f: BinaryIO):
         """
         Extract metadata from FLAC file
         
         Args:
             file_path: Path to FLAC file
-            track_info: Track info dictionary to update
+            track_info: Track info to update
+            f: Open handle of the file
         """
         try:
-            audio = FLAC(file_path)
+            audio = FLAC(f)
             
             # Title
             if 'title' in audio:
-                track_info['title'] = str(audio['title'][0])
+                track_info.title = str(audio['title'][0])
             
             # Artist
             if 'artist' in audio:
-                track_info['artist'] = str(audio['artist'][0])
+                track_info.artist = str(audio['artist'][0])
             
             # Album
             if 'album' in audio:
-                track_info['album'] = str(audio['album'][0])
+                track_info.album = str(audio['album'][0])
             
             # Year
             if 'date' in audio:
-                track_info['year'] = str(audio['date'][0])
+                track_info.year = str(audio['date'][0])
             
             # Check for cover art
             if audio.pictures:
-                track_info['has_cover'] = True
+                track_info.has_cover = True
         except Exception as e:
             logger.error(f"Error reading FLAC metadata from {file_path}: {str(e)}")
     
-    def _extract_m4a_info(self, file_path: str, track_info: Dict[str, Any]):
+    def _extract_m4a_info(self, file_path: str, track_info: TrackInfo, f: BinaryIO):
         """
         Extract metadata from M4A file
         
         Args:
             file_path: Path to M4A file
-            track_info: Track info dictionary to update
+            track_info: Track info to update
+            f: Open handle of the file
         """
         try:
-            audio = MP4(file_path)
+            audio = MP4(f)
             
             # Title
             if '\xa9nam' in audio:
-                track_info['title'] = str(audio['\xa9nam'][0])
+                track_info.title = str(audio['\xa9nam'][0])
             
             # Artist
             if '\xa9ART' in audio:
-                track_info['artist'] = str(audio['\xa9ART'][0])
+                track_info.artist = str(audio['\xa9ART'][0])
             
             # Album
             if '\xa9alb' in audio:
-                track_info['album'] = str(audio['\xa9alb'][0])
+                track_info.album = str(audio['\xa9alb'][0])
             
             # Year
             if '\xa9day' in audio:
-                track_info['year'] = str(audio['\xa9day'][0])
+                track_info.year = str(audio['\xa9day'][0])
             
             # Check for cover art
             if 'covr' in audio:
-                track_info['has_cover'] = True
+                track_info.has_cover = True
         except Exception as e:
             logger.error(f"Error reading M4A metadata from {file_path}: {str(e)}")
@@ -0,0 +1,29 @@
+"""
+Track information module
+Defines the record produced for each file by the library scanner
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Dict, Any
+
+@dataclass(slots=True)
+class TrackInfo:
+    """Information about a single music file in the library"""
+    file_path: str
+    filename: str
+    size: int
+    title: str = ''
+    artist: str = ''
+    album: str = ''
+    year: str = ''
+    has_cover: bool = False
+    fingerprint: str = ''
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Convert the track information to a dictionary
+        
+        Returns:
+            Dictionary with track information
+        """
+        return asdict(self)
@@ -11,12 +11,6 @@ and a local music library manager.
 import os
 import sys
 import logging
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon
-from PyQt6.QtCore import QDir
-
-from gui.main_window import MainWindow
-from utils.config import Config
 
 # Configure logging
 logging.basicConfig(
@@ -31,10 +25,21 @@ logger = logging.getLogger(__name__)
 def main():
     """Main application entry point"""
     try:
+        # Qt and the GUI modules are imported here so importing this module stays cheap
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import QDir
+        
+        from gui.main_window import MainWindow
+        from gui.style import get_stylesheet, Theme
+        from utils.config import Config
+        
         # Create application instance
         app = QApplication(sys.argv)
         app.setApplicationName("Music Downloader & Library Manager")
         
+        # Apply the stylesheet once, before any widgets are created
+        app.setStyleSheet(get_stylesheet(Theme.DARK))
+        
         # Set working directory to the script location
         os.chdir(os.path.dirname(os.path.abspath(__file__)))
         
@@ -45,8 +50,7 @@ def main():
         if not config.download_location:
             home_dir = QDir.homePath()
             music_dir = os.path.join(home_dir, "Music")
-            if not os.path.exists(music_dir):
-                os.makedirs(music_dir)
+            os.makedirs(music_dir, exist_ok=True)
             config.download_location = music_dir
             config.save()
         
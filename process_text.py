@@ -4,35 +4,117 @@ Provides functions for text processing and normalization
 """
 
 import re
+import logging
+import threading
 import unicodedata
-from typing import Tuple
+from typing import Iterable, Tuple
 
-def clean_filename(filename: str) -> str:
+# Optional: Hyperscan checks all title patterns in a single pass
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+logger = logging.getLogger(__name__)
+
+# Patterns are compiled once at import instead of on every call
+_INVALID_CHARS_TABLE = str.maketrans('', '', '\\/*?:"<>|')
+_WHITESPACE = re.compile(r'\s+')
+_PARENTHESES = re.compile(r'\([^)]*\)')
+_BRACKETS = re.compile(r'\[[^\]]*\]')
+
+# Common patterns in music video titles, with whether the song comes first
+_SONG_PATTERNS = [
+    # Artist - Song
+    (re.compile(r'^(.*?)\s*-\s*(.*?)$'), False),
+    # Artist "Song"
+    (re.compile(r'^(.*?)\s*"(.*?)"'), False),
+    # Artist 'Song'
+    (re.compile(r'^(.*?)\s*\'(.*?)\''), False),
+    # Artist: Song
+    (re.compile(r'^(.*?)\s*:\s*(.*?)$'), False),
+    # Artist | Song
+    (re.compile(r'^(.*?)\s*\|\s*(.*?)$'), False),
+    # Song by Artist
+    (re.compile(r'^(.*?)\s*by\s*(.*?)$'), True),
+]
+
+def _compile_song_database():
     """
-    Clean a filename by removing invalid characters
+    Compile the title patterns into one Hyperscan database
+    
+    Returns:
+        The compiled database or None if Hyperscan is unavailable
+    """
+    if hyperscan is None:
+        return None
+    
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.pattern.encode('utf-8') for pattern, _ in _SONG_PATTERNS],
+            ids=list(range(len(_SONG_PATTERNS))),
+            elements=len(_SONG_PATTERNS),
+            flags=[hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP] * len(_SONG_PATTERNS)
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Hyperscan unavailable, using re: {str(e)}")
+        return None
+
+_SONG_DATABASE = _compile_song_database()
+_SONG_DATABASE_LOCK = threading.Lock()
+
+def _matching_song_patterns(title: str) -> Iterable[int]:
+    """
+    Get the indexes of title patterns that can match, in priority order
     
     Args:
-        filename: The filename to clean
+        title: Video title
         
     Returns:
-        Cleaned filename
+        Pattern indexes to try with re for group extraction
     """
-    # Replace characters not allowed in filenames
-    invalid_chars = r'[\\/*?:"<>|]'
-    cleaned = re.sub(invalid_chars, '', filename)
+    if _SONG_DATABASE is None:
+        return range(len(_SONG_PATTERNS))
+    
+    matched = set()
     
-    # Replace multiple spaces with a single space
-    cleaned = re.sub(r'\s+', ' ', cleaned)
+    def on_match(pattern_id, start, end, flags, context):
+        matched.add(pattern_id)
     
-    # Trim leading/trailing spaces
-    cleaned = cleaned.strip()
+    # A database's scratch space is not safe to share between threads
+    with _SONG_DATABASE_LOCK:
+        _SONG_DATABASE.scan(title.encode('utf-8'), match_event_handler=on_match)
+    return sorted(matched)
+
+# Common terms that interfere with music search
+NOISE_TERMS = [
+    'official', 'video', 'music video', 'lyric video', 'audio',
+    'official audio', 'official music video', 'lyrics', 'hq', 'hd',
+    'full album', 'full song', 'live', 'cover'
+]
+
+# One alternation matching any term as a whole word, longest terms first so
+# phrases like "official music video" are removed before their parts
+_NOISE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(term) for term in sorted(NOISE_TERMS, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+def clean_filename(filename: str) -> str:
+    """
+    Clean a filename by removing invalid characters
     
-    # Limit length to avoid issues with long filenames
-    max_length = 100
-    if len(cleaned) > max_length:
-        cleaned = cleaned[:max_length]
+    Args:
+        filename: The filename to clean
         
-    return cleaned
+    Returns:
+        Cleaned filename
+    """
+    # Remove characters not allowed in filenames, collapse whitespace, trim,
+    # and limit length to avoid issues with long filenames
+    return _WHITESPACE.sub(' ', filename.translate(_INVALID_CHARS_TABLE)).strip()[:100]
 
 def normalize_text(text: str) -> str:
     """
@@ -51,7 +133,7 @@ def normalize_text(text: str) -> str:
     text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII')
     
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE.sub(' ', text).strip()
     
     return text
 
@@ -65,28 +147,13 @@ def extract_song_info(title: str) -> Tuple[str, str]:
     Returns:
         Tuple of (artist, song_name)
     """
-    # Common patterns in music video titles
-    patterns = [
-        # Artist - Song
-        r'^(.*?)\s*-\s*(.*?)$',
-        # Artist "Song"
-        r'^(.*?)\s*"(.*?)"',
-        # Artist 'Song'
-        r'^(.*?)\s*\'(.*?)\'',
-        # Artist: Song
-        r'^(.*?)\s*:\s*(.*?)$',
-        # Artist | Song
-        r'^(.*?)\s*\|\s*(.*?)$',
-        # Song by Artist
-        r'^(.*?)\s*by\s*(.*?)$',
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, title)
+    for index in _matching_song_patterns(title):
+        pattern, song_first = _SONG_PATTERNS[index]
+        match = pattern.match(title)
         if match:
             groups = match.groups()
             # Handle "Song by Artist" pattern differently
-            if pattern == r'^(.*?)\s*by\s*(.*?)$':
+            if song_first:
                 return groups[1].strip(), groups[0].strip()
             else:
                 return groups[0].strip(), groups[1].strip()
@@ -104,25 +171,16 @@ def clean_search_query(query: str) -> str:
     Returns:
         Cleaned query
     """
-    # Remove common terms that interfere with music search
-    noise_terms = [
-        'official', 'video', 'music video', 'lyric video', 'audio',
-        'official audio', 'official music video', 'lyrics', 'hq', 'hd',
-        'full album', 'full song', 'live', 'cover'
-    ]
-    
     query_lower = query.lower()
     
-    for term in noise_terms:
-        # Match the term as a whole word
-        pattern = r'\b' + re.escape(term) + r'\b'
-        query_lower = re.sub(pattern, '', query_lower)
+    # Remove common terms that interfere with music search in a single pass
+    query_lower = _NOISE.sub('', query_lower)
     
     # Remove parentheses and their contents (often contains "Official Video" etc.)
-    query_lower = re.sub(r'\([^)]*\)', '', query_lower)
-    query_lower = re.sub(r'\[[^\]]*\]', '', query_lower)
+    query_lower = _PARENTHESES.sub('', query_lower)
+    query_lower = _BRACKETS.sub('', query_lower)
     
     # Remove extra whitespace
-    query_lower = re.sub(r'\s+', ' ', query_lower).strip()
+    query_lower = _WHITESPACE.sub(' ', query_lower).strip()
     
     return query_lower
@@ -9,9 +9,35 @@ from typing import Dict, Any, Optional, List
 import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
 from utils.spotify_cache import get_spotify_cache
+from utils.helpers import create_http_session
+
+# Optional: orjson parses Spotify's JSON responses faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Retry settings matching the session spotipy builds itself: rate limits and
+# server errors are retried, honouring Retry-After
+SPOTIFY_RETRIES = 3
+SPOTIFY_BACKOFF_FACTOR = 0.3
+SPOTIFY_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def _parse_json_with_orjson(response, *args, **kwargs):
+    """
+    Response hook that makes response.json() parse the body with orjson
+    
+    Args:
+        response: The HTTP response
+        
+    Returns:
+        The same response
+    """
+    response.json = lambda **_: orjson.loads(response.content)
+    return response
+
 class SpotifySearch:
     """Class to handle Spotify searches and metadata retrieval"""
     
@@ -28,12 +54,20 @@ class SpotifySearch:
         
         if self.is_available:
             try:
-                # Set up Spotify client
+                # Set up Spotify client; token and API calls share one keep-alive session
+                session = create_http_session(
+                    retries=SPOTIFY_RETRIES,
+                    backoff_factor=SPOTIFY_BACKOFF_FACTOR,
+                    status_forcelist=SPOTIFY_RETRY_STATUSES
+                )
+                if orjson is not None:
+                    session.hooks['response'].append(_parse_json_with_orjson)
                 auth_manager = SpotifyClientCredentials(
                     client_id=client_id,
-                    client_secret=client_secret
+                    client_secret=client_secret,
+                    requests_session=session
                 )
-                self.spotify = spotipy.Spotify(auth_manager=auth_manager)
+                self.spotify = spotipy.Spotify(auth_manager=auth_manager, requests_session=session)
                 logger.info("Spotify API initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Spotify API: {str(e)}")
@@ -87,9 +121,8 @@ class SpotifySearch:
                 album_art = None
                 images = track.get('album', {}).get('images', [])
                 if images:
-                    # Sort by size and get the smallest for preview
-                    sorted_images = sorted(images, key=lambda x: x.get('width', 0))
-                    album_art = sorted_images[0]['url'] if sorted_images else None
+                    # Get the smallest for preview
+                    album_art = min(images, key=lambda x: x.get('width', 0))['url']
                 
                 # Format track info
                 track_info = {
@@ -101,7 +134,7 @@ class SpotifySearch:
                     'preview_url': track.get('preview_url'),
                     'release_date': track.get('album', {}).get('release_date', ''),
                     'duration_ms': track.get('duration_ms', 0),
-                    'artists': [{'name': artist['name']} for artist in track.get('artists', [])]
+                    'artists': [{'name': name} for name in artists]
                 }
                 
                 formatted_results.append(track_info)
@@ -130,42 +163,62 @@ class SpotifySearch:
             
         try:
             track = self.spotify.track(track_id)
-            
-            # Extract artists
-            artists = [artist['name'] for artist in track.get('artists', [])]
-            artist_names = ', '.join(artists)
-            
-            # Get highest quality album art for final metadata
-            album_art = None
-            images = track.get('album', {}).get('images', [])
-            if images:
-                # Sort by size and get the largest
-                sorted_images = sorted(images, key=lambda x: x.get('width', 0), reverse=True)
-                album_art = sorted_images[0]['url'] if sorted_images else None
-            
-            # Get release year
-            release_date = track.get('album', {}).get('release_date', '')
-            release_year = release_date.split('-')[0] if release_date else ''
-            
-            # Format track metadata
-            metadata = {
-                'title': track['name'],
-                'artist': artist_names,
-                'album': track.get('album', {}).get('name', ''),
-                'album_art_url': album_art,
-                'year': release_year,
-                'track_number': track.get('track_number'),
-                'disc_number': track.get('disc_number'),
-                'duration_ms': track.get('duration_ms'),
-                'explicit': track.get('explicit', False),
-                'isrc': track.get('external_ids', {}).get('isrc')
-            }
-            
-            return metadata
+            return self._format_track_metadata(track)
             
         except Exception as e:
             logger.error(f"Error getting track metadata: {str(e)}")
             return None
+    
+    @staticmethod
+    def _format_track_metadata(track: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Format a Spotify track object as the metadata used for tagging
+        
+        Args:
+            track: Track object returned by the Spotify API
+            
+        Returns:
+            Dictionary with track metadata
+        """
+        # Extract artists
+        artists = [artist['name'] for artist in track.get('artists', [])]
+        artist_names = ', '.join(artists)
+        
+        # Get highest quality album art for final metadata
+        album_art = None
+        images = track.get('album', {}).get('images', [])
+        if images:
+            # Get the largest
+            album_art = max(images, key=lambda x: x.get('width', 0))['url']
+        
+        # Get release year
+        release_date = track.get('album', {}).get('release_date', '')
+        release_year = release_date.split('-')[0] if release_date else ''
+        
+        # Format track metadata
+        return {
+            'title': track['name'],
+            'artist': artist_names,
+            'album': track.get('album', {}).get('name', ''),
+            'album_art_url': album_art,
+            'year': release_year,
+            'track_number': track.get('track_number'),
+            'disc_number': track.get('disc_number'),
+            'duration_ms': track.get('duration_ms'),
+            'explicit': track.get('explicit', False),
+            'isrc': track.get('external_ids', {}).get('isrc')
+        }
+
+# Shared instance for search_track_on_spotify, so the OAuth token and
+# connections are reused between calls
+_spotify_search = None
+
+def get_spotify_search() -> SpotifySearch:
+    """Get global Spotify search instance"""
+    global _spotify_search
+    if _spotify_search is None:
+        _spotify_search = SpotifySearch()
+    return _spotify_search
 
 def search_track_on_spotify(query: str) -> Optional[Dict[str, Any]]:
     """
@@ -177,7 +230,7 @@ def search_track_on_spotify(query: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary with track metadata or None if no match found
     """
-    spotify = SpotifySearch()
+    spotify = get_spotify_search()
     
     if not spotify.is_available:
         return None
@@ -3,7 +3,10 @@ YouTube Search Module
 Handles searching for videos on YouTube using yt-dlp
 """
 
+import time
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 import yt_dlp
 import subprocess
@@ -11,6 +14,10 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Search results are kept in memory so repeating a query skips yt-dlp entirely
+SEARCH_CACHE_SIZE = 128
+SEARCH_CACHE_TTL = 300  # seconds
+
 class YouTubeSearch:
     """Class to handle YouTube searches"""
     
@@ -19,10 +26,33 @@ class YouTubeSearch:
         self.ydl_opts = {
             'quiet': True,
             'no_warnings': True,
-            'extract_flat': True,
+            'extract_flat': 'in_playlist',  # Search entries only, no per-video page fetches
+            'skip_download': True,
             'default_search': 'ytsearch',
+            # Only metadata is read here, so skip fetching streaming manifests and subtitles
+            'extractor_args': {'youtube': {'skip': ['hls', 'dash', 'translated_subs']}},
         }
         
+        # One YoutubeDL is kept for the searcher's lifetime so its HTTP
+        # connections to YouTube stay open between queries
+        self._ydl = None
+        self._ydl_lock = threading.Lock()
+        
+        # (query, limit) -> (expiry time, results), least recently used first
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    def _get_ydl(self) -> yt_dlp.YoutubeDL:
+        """
+        Get the shared YoutubeDL instance, creating it on first use
+        
+        Returns:
+            The YoutubeDL instance
+        """
+        if self._ydl is None:
+            self._ydl = yt_dlp.YoutubeDL(self.ydl_opts)
+        return self._ydl
+        
     def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Search YouTube for the given query using yt-dlp
@@ -34,11 +64,23 @@ class YouTubeSearch:
         Returns:
             List of dictionaries with video info
         """
+        cache_key = (query, limit)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                expires, cached_results = cached
+                if expires > time.monotonic():
+                    self._cache.move_to_end(cache_key)
+                    logger.debug(f"Found cached YouTube results for: {query}")
+                    return cached_results.copy()
+                del self._cache[cache_key]
+        
         try:
             search_query = f"ytsearch{limit}:{query}"
             
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                search_results = ydl.extract_info(search_query, download=False)
+            # YoutubeDL is not thread-safe, so calls on the shared instance are serialized
+            with self._ydl_lock:
+                search_results = self._get_ydl().extract_info(search_query, download=False)
                 
                 if not search_results or 'entries' not in search_results:
                     logger.warning(f"No results found for query: {query}")
@@ -65,10 +107,17 @@ class YouTubeSearch:
                             'duration': duration_str,
                             'view_count': entry.get('view_count', 0),
                             'upload_date': entry.get('upload_date', ''),
-                            'description': entry.get('description', '')[:200] + '...' if entry.get('description') else ''
+                            'description': description[:200] + '...' if (description := entry.get('description')) else ''
                         })
-                
-                return results
+            
+            # Remember the results, dropping the least recently used entry when full
+            with self._cache_lock:
+                self._cache[cache_key] = (time.monotonic() + SEARCH_CACHE_TTL, results)
+                self._cache.move_to_end(cache_key)
+                if len(self._cache) > SEARCH_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            
+            return results.copy()
                 
         except Exception as e:
             logger.error(f"YouTube search error: {str(e)}")
@@ -87,8 +136,8 @@ class YouTubeSearch:
         try:
             url = f"https://www.youtube.com/watch?v={video_id}"
             
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+            with self._ydl_lock:
+                info = self._get_ydl().extract_info(url, download=False)
                 
                 if not info:
                     return None
@@ -110,7 +159,7 @@ class YouTubeSearch:
                     'url': url,
                     'view_count': info.get('view_count', 0),
                     'upload_date': info.get('upload_date', ''),
-                    'description': info.get('description', '')[:200] + '...' if info.get('description') else ''
+                    'description': description[:200] + '...' if (description := info.get('description')) else ''
                 }
             
         except Exception as e:
@@ -7,61 +7,300 @@ Works on Windows, macOS, and Linux
 
 import os
 import sys
+import argparse
+import compileall
+import importlib.metadata
+import importlib.util
 import subprocess
 import platform
-import urllib.request
-import zipfile
-import tarfile
+import re
+import io
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def run_command(command, check=True):
-    """Run a shell command and return the result"""
+# Optional: urllib3 keeps download connections alive and retries failures.
+# It is only picked up if installed before setup starts, since pip may be
+# writing it to site-packages while FFmpeg downloads.
+try:
+    import urllib3
+except ImportError:
+    urllib3 = None
+
+# Read size used when streaming FFmpeg archives
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Written to credentials.env on first setup
+CREDENTIALS_TEMPLATE = b"""# Spotify API Credentials
+# Get these from: https://developer.spotify.com/dashboard
+SPOTIFY_CLIENT_ID=your_client_id_here
+SPOTIFY_CLIENT_SECRET=your_client_secret_here
+
+# Optional: Custom download directory
+# DOWNLOAD_DIR=/path/to/your/music/folder
+"""
+
+# The only files needed from the FFmpeg archives
+FFMPEG_EXECUTABLES = {'ffmpeg', 'ffprobe', 'ffmpeg.exe', 'ffprobe.exe'}
+
+# Guards PATH while packages and FFmpeg are installed from separate threads
+_environ_lock = threading.Lock()
+
+def run_command(command, capture=False):
+    """Run a command, given as a list of arguments, and return the result
+    
+    The program is started directly, without an intermediate shell. Its
+    output goes straight to the terminal unless capture is set, in which
+    case stdout and stderr are returned as strings
+    """
+    pipe = subprocess.PIPE if capture else None
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, check=check)
-        return result.returncode == 0, result.stdout, result.stderr
-    except subprocess.CalledProcessError as e:
-        return False, e.stdout, e.stderr
+        with _environ_lock:
+            process = subprocess.Popen(command, stdout=pipe, stderr=pipe, text=capture)
+        stdout, stderr = process.communicate()
+        return process.returncode == 0, stdout or '', stderr or ''
+    except OSError as e:
+        # Program not found when running without a shell
+        return False, '', str(e)
+
+def add_to_path(directory):
+    """Put a directory first on PATH for this setup run"""
+    with _environ_lock:
+        os.environ['PATH'] = str(directory) + os.pathsep + os.environ.get('PATH', '')
 
 def check_python_version():
-    """Check if Python version is 3.8 or higher"""
+    """Check if Python version is 3.10 or higher"""
     version = sys.version_info
-    if version.major < 3 or (version.major == 3 and version.minor < 8):
-        print(f"❌ Python 3.8+ required. Current version: {version.major}.{version.minor}")
+    if version.major < 3 or (version.major == 3 and version.minor < 10):
+        print(f"❌ Python 3.10+ required. Current version: {version.major}.{version.minor}")
         sys.exit(1)
     print(f"✅ Python {version.major}.{version.minor}.{version.micro}")
 
-def install_pip_packages():
-    """Install required Python packages"""
+def missing_packages(packages):
+    """Return the requirements from packages that are not already satisfied"""
+    # packaging is not always installed on its own, but pip ships a copy
+    try:
+        from packaging.requirements import Requirement
+    except ImportError:
+        try:
+            from pip._vendor.packaging.requirements import Requirement
+        except ImportError:
+            return list(packages)
+    
+    missing = []
+    for package in packages:
+        requirement = Requirement(package)
+        try:
+            installed = importlib.metadata.version(requirement.name)
+        except importlib.metadata.PackageNotFoundError:
+            missing.append(package)
+            continue
+        if not requirement.specifier.contains(installed, prereleases=True):
+            missing.append(package)
+    return missing
+
+def install_pip_packages(log=None):
+    """Install required Python packages
+    
+    When a log list is given, messages and pip's errors are appended to it
+    instead of going to the terminal, and pip's own output is captured
+    """
+    capture = log is not None
+    report = log.append if capture else print
     packages = [
         'yt-dlp>=2024.1.0',
         'mutagen>=1.45.0',
         'spotipy>=2.22.0',
         'requests>=2.28.0',
         'PyQt6>=6.4.0',
-        'fuzzywuzzy>=0.18.0',
-        'python-Levenshtein>=0.20.0'
+        'rapidfuzz>=3.0.0'
     ]
     
-    print("📦 Installing Python packages...")
+    report("📦 Installing Python packages...")
+    # PyQt6 cannot realistically be built from source here, so never try
+    pip_install = [sys.executable, '-m', 'pip', 'install',
+                   '--disable-pip-version-check', '--no-input', '--prefer-binary',
+                   '--only-binary=PyQt6,PyQt6-Qt6']
+    
+    # Only hand pip what is missing, so re-running setup needs no index lookups
+    missing = missing_packages(packages)
+    for package in packages:
+        if package not in missing:
+            report(f"  ✅ {package} (already installed)")
+    if not missing:
+        return
+    packages = missing
+    
+    # Install everything in one pip call so dependencies are resolved once
+    success, _, _ = run_command(pip_install + packages, capture=capture)
+    if success:
+        for package in packages:
+            report(f"  ✅ {package}")
+        return
+    
+    # Fall back to one package at a time to find out which ones failed
     for package in packages:
-        print(f"  Installing {package}...")
-        success, stdout, stderr = run_command(f'pip install "{package}"')
+        report(f"  Installing {package}...")
+        success, _, stderr = run_command(pip_install + [package], capture=capture)
         if not success:
-            print(f"  ⚠️  Failed to install {package}: {stderr}")
+            # Uncaptured, pip has already printed its error above
+            report(f"  ⚠️  Failed to install {package}" + (f": {stderr}" if capture else ""))
         else:
-            print(f"  ✅ {package}")
+            report(f"  ✅ {package}")
+
+# Shared connection pool for downloads, created on first use
+_http_pool = None
+
+def get_http_pool():
+    """Get the shared urllib3 connection pool, or None if urllib3 is unavailable"""
+    global _http_pool
+    if _http_pool is None and urllib3 is not None:
+        _http_pool = urllib3.PoolManager(maxsize=4, retries=urllib3.Retry(3, backoff_factor=0.3))
+    return _http_pool
+
+def open_url(url, headers=None):
+    """Open a URL for streaming, reusing pooled connections when urllib3 is available"""
+    pool = get_http_pool()
+    if pool is None:
+        import urllib.request
+        return urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=60)
+    
+    response = pool.request('GET', url, headers=headers, preload_content=False, timeout=60.0)
+    if response.status >= 400:
+        response.release_conn()
+        raise OSError(f"HTTP {response.status} downloading {url}")
+    return response
+
+def download_to_memory(url):
+    """Download a file into memory in large chunks
+    
+    Zip archives keep their index at the end so they cannot be extracted
+    while streaming, but buffering in memory still avoids a temporary file
+    """
+    with open_url(url) as response:
+        return read_to_memory(response)
+
+def read_to_memory(response):
+    """Read an HTTP response body into memory in large chunks"""
+    buffer = io.BytesIO()
+    shutil.copyfileobj(response, buffer, length=DOWNLOAD_CHUNK_SIZE)
+    buffer.seek(0)
+    return buffer
+
+class HTTPRangeReader(io.RawIOBase):
+    """Seekable read-only file backed by HTTP range requests"""
+    
+    def __init__(self, url, size):
+        self._url = url
+        self._size = size
+        self._pos = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self._pos
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._pos = max(0, offset)
+        return self._pos
+    
+    def readinto(self, buffer):
+        if self._pos >= self._size or not len(buffer):
+            return 0
+        
+        end = min(self._pos + len(buffer), self._size) - 1
+        with open_url(self._url, headers={'Range': f'bytes={self._pos}-{end}'}) as response:
+            # Anything but the requested range means the server stopped honouring Range
+            content_range = response.headers.get('Content-Range', '')
+            if response.status != 206 or not content_range.startswith(f'bytes {self._pos}-'):
+                raise OSError(f"Server did not return the requested range of {self._url}")
+            data = response.read(end - self._pos + 1)
+        if not data:
+            raise OSError(f"Unexpected end of data reading {self._url}")
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+def import_zipfile():
+    """Import zipfile on first use, since only the zip-based FFmpeg installs need it"""
+    import zipfile
+    
+    # Optional: zlib-ng inflates the FFmpeg zip archives faster than the stdlib zlib
+    try:
+        from zlib_ng import zlib_ng
+        zipfile.zlib = zlib_ng
+    except ImportError:
+        pass
+    return zipfile
+
+def open_remote_zip(url):
+    """Open a zip archive on a web server for reading
+    
+    When urllib3 is available and the server supports range requests only
+    the archive index and the members that are read get downloaded, otherwise
+    the whole archive is buffered in memory
+    """
+    zipfile = import_zipfile()
+    if get_http_pool() is None:
+        # Without a connection pool every range read would pay for a new
+        # connection and TLS handshake, so one streamed download is faster
+        return zipfile.ZipFile(download_to_memory(url), 'r')
+    
+    with open_url(url, headers={'Range': 'bytes=0-0'}) as response:
+        content_range = response.headers.get('Content-Range', '')
+        if response.status != 206 or '/' not in content_range or content_range.endswith('/*'):
+            # Range was ignored and the whole archive is on its way, so keep it
+            return zipfile.ZipFile(read_to_memory(response), 'r')
+    
+    size = int(content_range.rsplit('/', 1)[1])
+    reader = io.BufferedReader(HTTPRangeReader(url, size), buffer_size=DOWNLOAD_CHUNK_SIZE)
+    return zipfile.ZipFile(reader, 'r')
+
+def write_executable(source, dest_path):
+    """Copy an archive member to dest_path and make it executable
+    
+    The file is written next to dest_path and swapped in with os.replace,
+    so an existing binary is replaced atomically and never left half written.
+    No fsync is done since a lost install is simply redone on the next run.
+    """
+    tmp_path = f"{dest_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        shutil.copyfileobj(source, f, length=DOWNLOAD_CHUNK_SIZE)
+    os.chmod(tmp_path, 0o755)
+    os.replace(tmp_path, dest_path)
+
+def extract_zip_executables(zip_ref, bin_dir):
+    """Extract only the FFmpeg executables from a zip archive into bin_dir"""
+    for name in zip_ref.namelist():
+        exe_name = os.path.basename(name)
+        if exe_name in FFMPEG_EXECUTABLES:
+            with zip_ref.open(name) as source:
+                write_executable(source, bin_dir / exe_name)
 
 def check_ffmpeg():
-    """Check if FFmpeg is available"""
-    success, stdout, stderr = run_command('ffmpeg -version', check=False)
-    if success:
+    """Check if FFmpeg is available on PATH"""
+    if shutil.which('ffmpeg') is not None:
         print("✅ FFmpeg is available")
         return True
     else:
         print("❌ FFmpeg not found")
         return False
 
+def verify_ffmpeg():
+    """Verify that the FFmpeg on PATH actually runs"""
+    # Capture the version banner so it does not clutter the setup output
+    success, _, _ = run_command(['ffmpeg', '-version'], capture=True)
+    return success
+
 def install_ffmpeg_windows():
     """Install FFmpeg on Windows"""
     print("📦 Installing FFmpeg for Windows...")
@@ -72,30 +311,15 @@ def install_ffmpeg_windows():
     
     # Download FFmpeg
     ffmpeg_url = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
-    zip_path = bin_dir / "ffmpeg.zip"
     
     print("  Downloading FFmpeg...")
-    urllib.request.urlretrieve(ffmpeg_url, zip_path)
-    
-    # Extract FFmpeg
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(bin_dir)
-    
-    # Find and move executables
-    for item in bin_dir.iterdir():
-        if item.is_dir() and 'ffmpeg' in item.name:
-            ffmpeg_bin = item / 'bin'
-            if ffmpeg_bin.exists():
-                for exe in ffmpeg_bin.glob('*.exe'):
-                    shutil.move(str(exe), str(bin_dir / exe.name))
-                shutil.rmtree(item)
-                break
     
-    # Clean up
-    zip_path.unlink()
+    # Extract the executables, skipping ffplay and the docs and presets bundled with them
+    with open_remote_zip(ffmpeg_url) as zip_ref:
+        extract_zip_executables(zip_ref, bin_dir)
     
     # Add to PATH for current session
-    os.environ['PATH'] = str(bin_dir) + os.pathsep + os.environ.get('PATH', '')
+    add_to_path(bin_dir)
     print("✅ FFmpeg installed locally")
 
 def install_ffmpeg_macos():
@@ -103,81 +327,86 @@ def install_ffmpeg_macos():
     print("📦 Installing FFmpeg for macOS...")
     
     # Try Homebrew first
-    success, stdout, stderr = run_command('brew --version', check=False)
-    if success:
+    if shutil.which('brew') is not None:
         print("  Using Homebrew...")
-        success, stdout, stderr = run_command('brew install ffmpeg')
-        if success:
+        # Run brew directly (no intermediate shell) and stream its output
+        process = subprocess.Popen(['brew', 'install', 'ffmpeg'],
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        for line in iter(process.stdout.readline, ''):
+            print(f"    {line.rstrip()}")
+        process.wait()
+        if process.returncode == 0:
             print("✅ FFmpeg installed via Homebrew")
             return
+        print(f"  ⚠️  Homebrew install failed (exit code {process.returncode})")
     
     # Fallback to static build
     print("  Using static build...")
     bin_dir = Path.cwd() / 'bin'
     bin_dir.mkdir(exist_ok=True)
     
-    ffmpeg_url = "https://evermeet.cx/ffmpeg/ffmpeg-5.1.2.zip"
-    zip_path = bin_dir / "ffmpeg.zip"
+    # evermeet.cx ships ffmpeg and ffprobe as separate archives
+    ffmpeg_urls = [
+        "https://evermeet.cx/ffmpeg/ffmpeg-5.1.2.zip",
+        "https://evermeet.cx/ffmpeg/ffprobe-5.1.2.zip",
+    ]
     
-    urllib.request.urlretrieve(ffmpeg_url, zip_path)
+    zipfile = import_zipfile()
     
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(bin_dir)
+    def fetch_and_extract(url):
+        with zipfile.ZipFile(download_to_memory(url), 'r') as zip_ref:
+            extract_zip_executables(zip_ref, bin_dir)
     
-    zip_path.unlink()
+    # Fetch both archives at once so the transfers overlap
+    with ThreadPoolExecutor(max_workers=len(ffmpeg_urls)) as executor:
+        list(executor.map(fetch_and_extract, ffmpeg_urls))
     
-    # Make executable
     ffmpeg_path = bin_dir / 'ffmpeg'
     if ffmpeg_path.exists():
-        os.chmod(ffmpeg_path, 0o755)
-        os.environ['PATH'] = str(bin_dir) + os.pathsep + os.environ.get('PATH', '')
+        add_to_path(bin_dir)
         print("✅ FFmpeg installed locally")
 
 def install_ffmpeg_linux():
     """Install FFmpeg on Linux"""
     print("📦 Installing FFmpeg for Linux...")
     
-    # Try package managers
-    distro_commands = [
-        'apt-get update && apt-get install -y ffmpeg',  # Ubuntu/Debian
-        'yum install -y ffmpeg',                        # CentOS/RHEL
-        'dnf install -y ffmpeg',                        # Fedora
-        'pacman -S --noconfirm ffmpeg',                 # Arch
-        'zypper install -y ffmpeg'                      # openSUSE
-    ]
-    
-    for cmd in distro_commands:
-        success, stdout, stderr = run_command(f'sudo {cmd}', check=False)
-        if success:
-            print(f"✅ FFmpeg installed via system package manager")
+    # Package managers with the commands to run in order; dnf comes before yum
+    # since Fedora keeps yum as an alias
+    distro_commands = {
+        'apt-get': [['apt-get', 'update'], ['apt-get', 'install', '-y', 'ffmpeg']],  # Ubuntu/Debian
+        'dnf': [['dnf', 'install', '-y', 'ffmpeg']],                                 # Fedora
+        'yum': [['yum', 'install', '-y', 'ffmpeg']],                                 # CentOS/RHEL
+        'pacman': [['pacman', '-S', '--noconfirm', 'ffmpeg']],                       # Arch
+        'zypper': [['zypper', 'install', '-y', 'ffmpeg']]                            # openSUSE
+    }
+    
+    # Only run the package manager this system actually has
+    manager = next((name for name in distro_commands if shutil.which(name)), None)
+    if manager:
+        if all(run_command(['sudo'] + cmd)[0] for cmd in distro_commands[manager]):
+            print(f"✅ FFmpeg installed via {manager}")
             return
+        print(f"  ⚠️  Installing with {manager} failed")
     
     # Fallback to static build
     print("  Using static build...")
     bin_dir = Path.cwd() / 'bin'
     bin_dir.mkdir(exist_ok=True)
     
+    import tarfile
     ffmpeg_url = "https://johnvansickle.com/ffmpeg/builds/ffmpeg-git-amd64-static.tar.xz"
-    tar_path = bin_dir / "ffmpeg.tar.xz"
-    
-    urllib.request.urlretrieve(ffmpeg_url, tar_path)
-    
-    with tarfile.open(tar_path, 'r:xz') as tar_ref:
-        tar_ref.extractall(bin_dir)
-    
-    # Find and move executables
-    for item in bin_dir.iterdir():
-        if item.is_dir() and 'ffmpeg' in item.name:
-            for exe in ['ffmpeg', 'ffprobe']:
-                exe_path = item / exe
-                if exe_path.exists():
-                    shutil.move(str(exe_path), str(bin_dir / exe))
-                    os.chmod(bin_dir / exe, 0o755)
-            shutil.rmtree(item)
-            break
-    
-    tar_path.unlink()
-    os.environ['PATH'] = str(bin_dir) + os.pathsep + os.environ.get('PATH', '')
+    
+    # Decompress the archive as it downloads instead of saving it first,
+    # writing out only the executables
+    with open_url(ffmpeg_url) as response, \
+            tarfile.open(fileobj=response, mode='r|xz', bufsize=DOWNLOAD_CHUNK_SIZE) as tar_ref:
+        for member in tar_ref:
+            exe_name = os.path.basename(member.name)
+            if member.isfile() and exe_name in FFMPEG_EXECUTABLES:
+                with tar_ref.extractfile(member) as source:
+                    write_executable(source, bin_dir / exe_name)
+    
+    add_to_path(bin_dir)
     print("✅ FFmpeg installed locally")
 
 def install_ffmpeg():
@@ -205,45 +434,75 @@ def create_credentials_file():
     credentials_path = Path('credentials.env')
     if not credentials_path.exists():
         print("📝 Creating credentials template...")
-        with open(credentials_path, 'w') as f:
-            f.write("""# Spotify API Credentials
-# Get these from: https://developer.spotify.com/dashboard
-SPOTIFY_CLIENT_ID=your_client_id_here
-SPOTIFY_CLIENT_SECRET=your_client_secret_here
-
-# Optional: Custom download directory
-# DOWNLOAD_DIR=/path/to/your/music/folder
-""")
+        credentials_path.write_bytes(CREDENTIALS_TEMPLATE)
         print("✅ Created credentials.env template")
         print("   Please edit credentials.env with your Spotify API keys")
     else:
         print("✅ credentials.env already exists")
 
-def test_installation():
-    """Test if the installation was successful"""
+def precompile_sources():
+    """Byte-compile the application modules so the first launch does not have to"""
+    app_dir = Path(__file__).resolve().parent
+    
+    # Skip virtual environments and other folders that are not part of the app
+    skip = re.compile(r'[\\/](\.?venv|\.git|bin|build|dist)[\\/]')
+    success = compileall.compile_dir(app_dir, quiet=1, rx=skip)
+    if success:
+        print("✅ Precompiled application modules")
+    else:
+        print("⚠️  Some modules could not be precompiled")
+
+def is_installed(module, dist_name):
+    """Check whether a package is installed without importing it"""
+    try:
+        importlib.metadata.distribution(dist_name)
+        return True
+    except importlib.metadata.PackageNotFoundError:
+        # Not installed by pip, it may still be importable
+        try:
+            return importlib.util.find_spec(module) is not None
+        except ImportError:
+            return False
+
+def test_installation(verify=False):
+    """Test if the installation was successful
+    
+    Modules are only imported and FFmpeg is only run when verify is set,
+    otherwise reading the installed package metadata and a PATH lookup is enough
+    """
     print("🧪 Testing installation...")
     
-    # Test Python imports
-    test_imports = [
-        'yt_dlp',
-        'mutagen', 
-        'spotipy',
-        'requests',
-        'PyQt6.QtWidgets',
-        'fuzzywuzzy'
-    ]
+    # Test Python imports, with the distribution that provides each module
+    test_imports = {
+        'yt_dlp': 'yt-dlp',
+        'mutagen': 'mutagen',
+        'spotipy': 'spotipy',
+        'requests': 'requests',
+        'PyQt6.QtWidgets': 'PyQt6',
+        'rapidfuzz': 'rapidfuzz'
+    }
+    
+    if verify:
+        # Import each module in its own interpreter, all started at once so the heavy
+        # imports run side by side and a crashing import only fails its own check
+        processes = [subprocess.Popen([sys.executable, '-c', f'import {module}'],
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                     for module in test_imports]
+        results = [process.wait() == 0 for process in processes]
+    else:
+        results = [is_installed(module, dist_name) for module, dist_name in test_imports.items()]
     
     failed_imports = []
-    for module in test_imports:
-        try:
-            __import__(module)
+    for module, found in zip(test_imports, results):
+        if found:
             print(f"  ✅ {module}")
-        except ImportError:
+        else:
             print(f"  ❌ {module}")
             failed_imports.append(module)
     
     # Test FFmpeg
-    if check_ffmpeg():
+    ffmpeg_ok = verify_ffmpeg() if verify else shutil.which('ffmpeg') is not None
+    if ffmpeg_ok:
         print("  ✅ ffmpeg")
     else:
         print("  ⚠️  ffmpeg (will try imageio-ffmpeg fallback)")
@@ -257,23 +516,35 @@ def test_installation():
 
 def main():
     """Main setup function"""
+    parser = argparse.ArgumentParser(description="Music Downloader setup")
+    parser.add_argument('--verify', action='store_true',
+                        help="import each package and run ffmpeg after setup to verify they work")
+    args = parser.parse_args()
+    
     print("🎵 Music Downloader Setup")
     print("=" * 40)
     
     # Check Python version
     check_python_version()
     
-    # Install Python packages
-    install_pip_packages()
-    
-    # Install FFmpeg
-    install_ffmpeg()
+    # Install Python packages and FFmpeg side by side, neither depends on the other.
+    # The FFmpeg installer may ask for a sudo password, so it keeps the terminal
+    # while pip's output is collected and shown once both are done
+    pip_log = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(install_pip_packages, pip_log), executor.submit(install_ffmpeg)]
+    print("\n".join(pip_log))
+    for future in futures:
+        future.result()
     
     # Create credentials file
     create_credentials_file()
     
+    # Precompile modules
+    precompile_sources()
+    
     # Test installation
-    success = test_installation()
+    success = test_installation(verify=args.verify)
     
     print("\n" + "=" * 40)
     if success:
@@ -77,8 +77,10 @@ class Config:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
             
+            # Serialize first so a value that cannot be encoded leaves the old file intact
+            payload = json.dumps(self.config, indent=4)
             with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=4)
+                f.write(payload)
                 
             return True
             
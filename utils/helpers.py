@@ -6,7 +6,10 @@ import os
 import sys
 import logging
 import platform
-from typing import Optional
+from typing import Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -54,8 +57,8 @@ def ensure_dir_exists(directory: str) -> bool:
         True if directory exists or was created successfully, False otherwise
     """
     try:
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+        # exist_ok already covers the directory being there
+        os.makedirs(directory, exist_ok=True)
         return True
     except Exception as e:
         logger.error(f"Failed to create directory {directory}: {str(e)}")
@@ -102,3 +105,35 @@ def format_duration(duration_seconds: int) -> str:
         return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
     else:
         return f"{minutes:02d}:{seconds:02d}"
+
+def create_http_session(pool_connections: int = 4, pool_maxsize: int = 16,
+                        retries: int = 2, backoff_factor: float = 0.2,
+                        status_forcelist: Tuple[int, ...] = ()) -> requests.Session:
+    """
+    Create an HTTP session with a keep-alive connection pool and retries
+    
+    Args:
+        pool_connections: Number of hosts to keep connection pools for
+        pool_maxsize: Maximum connections kept per host
+        retries: Number of retries for failed requests
+        backoff_factor: Base delay in seconds between retries, doubled on each attempt
+        status_forcelist: HTTP status codes to retry, waiting as long as any
+                          Retry-After header asks
+        
+    Returns:
+        The configured session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            respect_retry_after_header=True
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
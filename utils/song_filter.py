@@ -5,7 +5,7 @@ Provides functions to filter YouTube results and match them with Spotify metadat
 
 import re
 from typing import List, Dict, Any, Tuple, Optional
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz
 from process_text import clean_search_query, extract_song_info, normalize_text
 
 class SongFilter:
@@ -148,32 +148,41 @@ class SongFilter:
             return results
         
         unique_results = []
+        unique_core_titles = []  # Lowercased core title of each unique result, extracted once
+        seen_ids = set()
         
         for result in results:
+            # The same video listed twice is always a duplicate
+            video_id = result.get('id')
+            if video_id:
+                if video_id in seen_ids:
+                    continue
+                seen_ids.add(video_id)
+            
             title = result.get('title', '')
             duration = result.get('duration', '')
             
             # Extract core song information for comparison
-            core_title = self._extract_core_title(title)
+            core_title = self._extract_core_title(title).lower()
             
             # Check if this is similar to any existing result
             is_duplicate = False
             for i, existing in enumerate(unique_results):
-                existing_core = self._extract_core_title(existing.get('title', ''))
-                
                 # Check title similarity and duration proximity
-                title_similarity = fuzz.ratio(core_title.lower(), existing_core.lower())
+                title_similarity = fuzz.ratio(core_title, unique_core_titles[i])
                 duration_similar = self._are_durations_similar(duration, existing.get('duration', ''))
                 
                 if title_similarity > 80 and duration_similar:
                     # This is a duplicate, decide which to keep
                     if self._is_better_source(result, existing):
                         unique_results[i] = result
+                        unique_core_titles[i] = core_title
                     is_duplicate = True
                     break
             
             if not is_duplicate:
                 unique_results.append(result)
+                unique_core_titles.append(core_title)
         
         return unique_results
     
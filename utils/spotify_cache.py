@@ -6,6 +6,7 @@ Implements intelligent caching to reduce API calls
 import hashlib
 import json
 import time
+import threading
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
@@ -24,6 +25,7 @@ class SpotifyCache:
         self.cache_dir.mkdir(exist_ok=True)
         self.cache_duration = cache_duration
         self.memory_cache = {}  # In-memory cache for current session
+        self._lock = threading.Lock()  # Searches may run from several threads at once
         
         # Load existing cache file
         self.cache_file = self.cache_dir / "spotify_search_cache.json"
@@ -52,13 +54,19 @@ class SpotifyCache:
         try:
             # Only save non-expired entries
             current_time = time.time()
-            valid_cache = {
-                key: entry for key, entry in self.memory_cache.items()
-                if current_time - entry.get('timestamp', 0) < self.cache_duration
-            }
+            with self._lock:
+                valid_cache = {
+                    key: entry for key, entry in self.memory_cache.items()
+                    if current_time - entry.get('timestamp', 0) < self.cache_duration
+                }
             
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(valid_cache, f, ensure_ascii=False, indent=2)
+            # Serialize outside the lock so other searches can keep storing results,
+            # then swap the file in so a failed save never leaves it truncated
+            payload = json.dumps(valid_cache, ensure_ascii=False, indent=2)
+            tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.{threading.get_ident()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            tmp_file.replace(self.cache_file)
         except Exception as e:
             print(f"[CACHE] Error saving cache: {e}")
     
@@ -85,17 +93,17 @@ class SpotifyCache:
         """
         cache_key = self._get_cache_key(query, limit)
         
-        if cache_key in self.memory_cache:
-            entry = self.memory_cache[cache_key]
-            
-            # Check if entry is still valid
-            if time.time() - entry.get('timestamp', 0) < self.cache_duration:
-                print(f"[CACHE HIT] Found cached results for: {query}")
-                return entry.get('results', [])
-            else:
-                # Remove expired entry
-                del self.memory_cache[cache_key]
-                print(f"[CACHE EXPIRED] Removed expired entry for: {query}")
+        with self._lock:
+            entry = self.memory_cache.get(cache_key)
+            if entry is not None:
+                # Check if entry is still valid
+                if time.time() - entry.get('timestamp', 0) < self.cache_duration:
+                    print(f"[CACHE HIT] Found cached results for: {query}")
+                    return entry.get('results', [])
+                else:
+                    # Remove expired entry
+                    self.memory_cache.pop(cache_key, None)
+                    print(f"[CACHE EXPIRED] Removed expired entry for: {query}")
         
         print(f"[CACHE MISS] No cached results for: {query}")
         return None
@@ -118,23 +126,26 @@ class SpotifyCache:
             'limit': limit
         }
         
-        self.memory_cache[cache_key] = entry
+        with self._lock:
+            self.memory_cache[cache_key] = entry
+            entry_count = len(self.memory_cache)
         print(f"[CACHE STORE] Cached {len(results)} results for: {query}")
         
         # Periodically save to disk (every 10 entries)
-        if len(self.memory_cache) % 10 == 0:
+        if entry_count % 10 == 0:
             self._save_cache()
     
     def clear_expired(self):
         """Remove all expired entries from cache"""
         current_time = time.time()
-        expired_keys = [
-            key for key, entry in self.memory_cache.items()
-            if current_time - entry.get('timestamp', 0) >= self.cache_duration
-        ]
-        
-        for key in expired_keys:
-            del self.memory_cache[key]
+        with self._lock:
+            expired_keys = [
+                key for key, entry in self.memory_cache.items()
+                if current_time - entry.get('timestamp', 0) >= self.cache_duration
+            ]
+            
+            for key in expired_keys:
+                del self.memory_cache[key]
         
         if expired_keys:
             print(f"[CACHE] Cleared {len(expired_keys)} expired entries")
@@ -143,13 +154,15 @@ class SpotifyCache:
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         current_time = time.time()
-        valid_entries = sum(
-            1 for entry in self.memory_cache.values()
-            if current_time - entry.get('timestamp', 0) < self.cache_duration
-        )
+        with self._lock:
+            valid_entries = sum(
+                1 for entry in self.memory_cache.values()
+                if current_time - entry.get('timestamp', 0) < self.cache_duration
+            )
+            total_entries = len(self.memory_cache)
         
         return {
-            'total_entries': len(self.memory_cache),
+            'total_entries': total_entries,
             'valid_entries': valid_entries,
             'cache_duration': self.cache_duration,
             'cache_file': str(self.cache_file)